@@ -0,0 +1,100 @@
+"""Benchmarks for Quest's maze generation algorithms.
+
+Generates mazes with each algorithm in :py:data:`quest.maze.MAZE_GENERATORS` and reports
+how fast each one is, how much memory it needs, and what kind of maze it makes (the
+fraction of nodes which are dead ends and which are junctions). For example::
+
+    $ python -m quest.bench.maze --algorithm kruskal eller --size 201 1001
+
+Use ``--json`` to get machine-readable output.
+"""
+
+from quest.maze import Maze, MAZE_GENERATORS, node_grid_size
+from quest.bench.physics import get_version
+from argparse import ArgumentParser
+from itertools import product
+from time import perf_counter
+import json
+import platform
+import tracemalloc
+
+def node_degrees(maze):
+    """Returns a NumPy array with the number of connections of each node in the maze.
+    """
+    width, height = node_grid_size(maze)
+    passages = maze.passages
+    return (
+        passages[2:2 * width + 1:2, 1:2 * height:2].astype(int) +
+        passages[0:2 * width - 1:2, 1:2 * height:2] +
+        passages[1:2 * width:2, 2:2 * height + 1:2] +
+        passages[1:2 * width:2, 0:2 * height - 1:2]
+    )
+
+def run_benchmark(algorithm, size, seed=0, repeat=3):
+    """Runs one benchmark configuration and returns a dict of results.
+
+    The maze is generated `repeat` times to measure time (the fastest run is reported),
+    and once more with :py:mod:`tracemalloc` running to measure memory.
+    """
+    maze = Maze(size, size)
+    times = []
+    for i in range(repeat):
+        start = perf_counter()
+        maze.generate(seed, algorithm)
+        times.append(perf_counter() - start)
+    seconds = min(times)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    maze.generate(seed, algorithm)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    degrees = node_degrees(maze)
+    nodes = degrees.size
+    return {
+        "algorithm": algorithm,
+        "size": size,
+        "nodes": nodes,
+        "seed": seed,
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds else None,
+        "peak_kib": peak / 1024,
+        "dead_ends": float((degrees == 1).sum() / nodes) if nodes else 0,
+        "junctions": float((degrees >= 3).sum() / nodes) if nodes else 0,
+    }
+
+def format_result(result):
+    return (
+        "{algorithm:>18} size={size:<5} {seconds:8.3f} s {nodes_per_second:12.0f} nodes/s  "
+        "peak {peak_kib:10.1f} KiB  dead ends {dead_ends:5.1%}  junctions {junctions:5.1%}"
+    ).format(**result)
+
+def main(argv=None):
+    algorithms = list(MAZE_GENERATORS)
+    parser = ArgumentParser(description="Benchmark Quest's maze generation algorithms.")
+    parser.add_argument("--algorithm", nargs="+", choices=algorithms, default=algorithms)
+    parser.add_argument("--size", nargs="+", type=int, default=[101, 501],
+            help="Columns and rows in the maze (odd numbers work best)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for algorithm, size in product(args.algorithm, args.size):
+        result = run_benchmark(algorithm, size, args.seed, args.repeat)
+        results.append(result)
+        if not args.json:
+            print(format_result(result))
+    if args.json:
+        report = {
+            "benchmark": "maze",
+            "quest_version": get_version(),
+            "python_version": platform.python_version(),
+            "results": results,
+        }
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
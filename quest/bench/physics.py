@@ -0,0 +1,268 @@
+"""Benchmarks for Quest's physics engines.
+
+Builds synthetic worlds (a maze of walls with some NPCs wandering around), runs them
+headless, and reports how many ticks per second each physics engine manages, how long
+each phase of a tick takes, and how much memory is allocated. For example::
+
+    $ python -m quest.bench.physics --engine continuous discrete --npcs 10 100 --size 33 99
+
+Use ``--json`` to get machine-readable output, which can be saved and compared across
+versions to catch performance regressions.
+"""
+
+from quest.game import QuestGame
+from quest.headless import HeadlessMixin
+from quest.map import Map, GridMapLayer
+from quest.maze import Maze
+from quest.sprite import Wall, NPC
+from quest.strategy import RandomWalk
+from quest.engines import ContinuousPhysicsEngine, DiscretePhysicsEngine
+from quest.helpers import resolve_resource_path
+from argparse import ArgumentParser
+from collections import defaultdict
+from itertools import product
+from time import perf_counter
+import json
+import platform
+import random
+import tracemalloc
+
+ENGINES = ["continuous", "discrete"]
+
+class PhaseTimer:
+    """Keeps track of how much time is spent in each phase of a tick.
+
+    :py:meth:`wrap` replaces a method on an object with a version which adds
+    its running time to one of the phase totals.
+    """
+    def __init__(self):
+        self.totals = defaultdict(float)
+
+    def wrap(self, obj, method_name, phase):
+        method = getattr(obj, method_name)
+        totals = self.totals
+        def timed_method(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                totals[phase] += perf_counter() - start
+        setattr(obj, method_name, timed_method)
+
+class SyntheticMap(Map):
+    """A map with a "walls" layer generated from a :py:class:`Maze <quest.maze.Maze>`.
+
+    Arguments:
+        columns (int): Number of columns of tiles.
+        rows (int): Number of rows of tiles.
+        tile_size (int): Size of each tile in pixels.
+        wall_density (float): Fraction of the maze's interior walls to keep. The
+            outer walls are always kept.
+        rng (random.Random): Source of randomness for removing walls.
+    """
+    def __init__(self, columns, rows, tile_size, wall_density, rng):
+        super().__init__()
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        layer = GridMapLayer(
+            name="walls",
+            columns=columns,
+            rows=rows,
+            pixel_width=columns * tile_size,
+            pixel_height=rows * tile_size,
+            sprite_filename=resolve_resource_path("images/box.png"),
+            sprite_class=Wall,
+        )
+        self.add_layer(layer)
+        maze = Maze(columns, rows)
+        maze.generate(rng.random())
+        walls = []
+        for x, y in maze.get_walls():
+            on_edge = x in (0, columns - 1) or y in (0, rows - 1)
+            if on_edge or rng.random() < wall_density:
+                walls.append((x, y))
+        layer.add_sprites(walls)
+
+    def open_positions(self):
+        """Returns pixel positions at the center of the maze's open cells.
+
+        :py:meth:`GridMapLayer.add_sprite <quest.map.GridMapLayer.add_sprite>` places each
+        wall's lower-left corner at the center of its grid cell, so open cells are centered
+        half a tile up and to the right of their grid cells' centers.
+        """
+        X = range(1, self.columns - 1, 2)
+        Y = range(1, self.rows - 1, 2)
+        return [((x + 1) * self.tile_size, (y + 1) * self.tile_size) for x, y in product(X, Y)]
+
+class BenchmarkGame(HeadlessMixin, QuestGame):
+    """A headless game built from a benchmark configuration.
+
+    Arguments:
+        engine (str): "continuous" or "discrete".
+        size (int): Number of columns and rows in the maze.
+        npcs (int): Number of NPCs, each following a :py:class:`RandomWalk <quest.strategy.RandomWalk>`.
+        wall_density (float): See :py:class:`SyntheticMap`.
+        seed (int): Random seed, so that runs are repeatable.
+    """
+    tile_size = 32
+    player_sprite_image = resolve_resource_path("images/boy_simple.png")
+    player_scaling = 0.3
+    player_speed = 3
+    npc_sprite_image = resolve_resource_path("images/people/grandma.png")
+    npc_scaling = 0.3
+    npc_speed = 2
+
+    def __init__(self, engine, size, npcs, wall_density, seed):
+        self.engine_name = engine
+        self.maze_size = size
+        self.num_npcs = npcs
+        self.wall_density = wall_density
+        self.rng = random.Random(seed)
+        random.seed(seed)
+        super().__init__()
+
+    def setup_maps(self):
+        super().setup_maps()
+        self.add_map(SyntheticMap(self.maze_size, self.maze_size, self.tile_size, self.wall_density, self.rng))
+
+    def setup_player(self):
+        self.player_initial_x, self.player_initial_y = self.get_current_map().open_positions()[0]
+        super().setup_player()
+        self.player.strategy = RandomWalk()
+
+    def setup_walls(self):
+        self.wall_list = self.get_current_map().get_layer_by_name("walls").sprite_list
+
+    def setup_npcs(self):
+        super().setup_npcs()
+        positions = self.get_current_map().open_positions()
+        for i in range(self.num_npcs):
+            npc = NPC(self.npc_sprite_image, self.npc_scaling)
+            npc.center_x, npc.center_y = self.rng.choice(positions)
+            npc.speed = self.npc_speed
+            npc.strategy = RandomWalk()
+            self.npc_list.append(npc)
+
+    def setup_physics_engine(self):
+        if self.engine_name == "continuous":
+            self.physics_engine = ContinuousPhysicsEngine(self)
+        elif self.engine_name == "discrete":
+            grid = self.get_current_map().get_layer_by_name("walls")
+            self.physics_engine = DiscretePhysicsEngine(self, grid)
+        else:
+            raise ValueError("Unknown engine: {}".format(self.engine_name))
+
+    def add_phase_timers(self, timer):
+        """Wraps the game's and engine's methods so that each phase is timed.
+        """
+        timer.wrap(self, "tick", "total")
+        timer.wrap(self, "scroll_viewport", "scroll")
+        timer.wrap(self.physics_engine, "update", "physics")
+        if self.engine_name == "continuous":
+            timer.wrap(self.physics_engine, "update_sprite_positions", "physics.integration")
+            timer.wrap(self.physics_engine, "resolve_collisions_with_walls", "physics.walls")
+            timer.wrap(self.physics_engine, "resolve_collisions_between_nonwalls", "physics.pairs")
+
+def run_benchmark(engine, size, npcs, wall_density, ticks, seed=0, allocation_ticks=100):
+    """Runs one benchmark configuration and returns a dict of results.
+
+    The game is run twice from the same seed: once for `ticks` ticks to measure time,
+    and once for `allocation_ticks` ticks with :py:mod:`tracemalloc` running to measure
+    memory allocation (tracemalloc slows everything down, so it would spoil the timing).
+    """
+    setup_start = perf_counter()
+    game = BenchmarkGame(engine, size, npcs, wall_density, seed)
+    setup_seconds = perf_counter() - setup_start
+    timer = PhaseTimer()
+    game.add_phase_timers(timer)
+    start = perf_counter()
+    ticks_run = game.run(ticks)
+    seconds = perf_counter() - start
+
+    total = timer.totals["total"]
+    phases = {
+        "sprite_updates": total - timer.totals["physics"] - timer.totals["scroll"],
+        "physics": timer.totals["physics"],
+        "scroll": timer.totals["scroll"],
+    }
+    for phase, phase_seconds in timer.totals.items():
+        if phase.startswith("physics."):
+            phases[phase] = phase_seconds
+
+    game = BenchmarkGame(engine, size, npcs, wall_density, seed)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    game.run(allocation_ticks)
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+
+    return {
+        "engine": engine,
+        "size": size,
+        "npcs": npcs,
+        "walls": len(game.wall_list),
+        "wall_density": wall_density,
+        "seed": seed,
+        "ticks": ticks_run,
+        "setup_seconds": setup_seconds,
+        "seconds": seconds,
+        "ticks_per_second": ticks_run / seconds if seconds else None,
+        "ms_per_tick": {phase: 1000 * s / max(ticks_run, 1) for phase, s in phases.items()},
+        "allocations": {
+            "ticks": allocation_ticks,
+            "peak_kib": peak / 1024,
+            "net_kib": sum(stat.size_diff for stat in diff) / 1024,
+            "net_blocks": sum(stat.count_diff for stat in diff),
+        },
+    }
+
+def format_result(result):
+    phases = ", ".join("{} {:.3f}".format(phase, ms) for phase, ms in result["ms_per_tick"].items())
+    return (
+        "{engine:>10} size={size:<4} npcs={npcs:<5} walls={walls:<6} "
+        "{ticks_per_second:8.1f} ticks/s  peak {peak:8.1f} KiB\n"
+        "           ms/tick: {phases}"
+    ).format(phases=phases, peak=result["allocations"]["peak_kib"], **result)
+
+def get_version():
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        return version("questgame")
+    except PackageNotFoundError:
+        return None
+
+def main(argv=None):
+    parser = ArgumentParser(description="Benchmark Quest's physics engines on synthetic worlds.")
+    parser.add_argument("--engine", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--size", nargs="+", type=int, default=[33, 99],
+            help="Columns and rows in the maze (odd numbers work best)")
+    parser.add_argument("--npcs", nargs="+", type=int, default=[10, 100])
+    parser.add_argument("--wall-density", nargs="+", type=float, default=[1.0],
+            help="Fraction of interior maze walls to keep")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--allocation-ticks", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for engine, size, npcs, density in product(args.engine, args.size, args.npcs, args.wall_density):
+        result = run_benchmark(engine, size, npcs, density, args.ticks, args.seed, args.allocation_ticks)
+        results.append(result)
+        if not args.json:
+            print(format_result(result))
+    if args.json:
+        report = {
+            "benchmark": "physics",
+            "quest_version": get_version(),
+            "python_version": platform.python_version(),
+            "results": results,
+        }
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from time import time
+
+class Clock:
+    """A Clock tells the game what time it is.
+
+    Usually game time is just the real time, but not always. When a game is being
+    simulated (for example by a :py:class:`HeadlessMixin <quest.headless.HeadlessMixin>`
+    game), it might run thousands of ticks per second; each tick should still count as
+    the same amount of game time, so that the results don't depend on how fast the
+    computer is. Anything in the game which depends on time should ask the game's clock
+    (`game.clock.time()`) instead of calling :py:func:`time.time` directly.
+
+    :py:meth:`QuestGame.tick <quest.game.QuestGame.tick>` calls :py:meth:`tick` at the
+    start of every tick. A plain Clock tells the real time; subclasses like
+    :py:class:`TickClock` keep their own time instead.
+    """
+    def time(self):
+        """Returns the current time, in seconds.
+        """
+        return time()
+
+    def tick(self):
+        """Called once at the start of each tick.
+        """
+        pass
+
+class WallClock(Clock):
+    """A clock which tells the real time. This is the same as a plain :py:class:`Clock`,
+    but the name makes it clear which kind of clock a game is using.
+    """
+
+class TickClock(Clock):
+    """A clock which counts ticks. Each tick advances time by `tick_duration` seconds.
+
+    Arguments:
+        tick_duration (float): Seconds of game time per tick.
+        start_time (float): The time before the first tick.
+    """
+    def __init__(self, tick_duration=1/60, start_time=0):
+        self.tick_duration = tick_duration
+        self.start_time = start_time
+        self.ticks = 0
+
+    def time(self):
+        return self.start_time + self.ticks * self.tick_duration
+
+    def tick(self):
+        self.ticks += 1
@@ -0,0 +1,422 @@
+from collections import defaultdict
+from math import floor
+import numpy as np
+
+def get_bounds(sprite):
+    """Returns the axis-aligned bounding box of a sprite's hit box.
+
+    This is equivalent to reading the sprite's `left`, `bottom`, `right`, and
+    `top` properties, but only computes the hit box once.
+
+    Arguments:
+        sprite (arcade.Sprite): The sprite.
+
+    Returns:
+        A (left, bottom, right, top) tuple.
+    """
+    points = sprite.get_adjusted_hit_box()
+    if len(points) == 0:
+        return sprite.center_x, sprite.center_y, sprite.center_x, sprite.center_y
+    xs = [x for x, y in points]
+    ys = [y for x, y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def bounds_overlap(a, b):
+    """Returns whether two (left, bottom, right, top) boxes overlap.
+
+    Boxes which only touch along an edge do not overlap, matching the behavior of
+    :py:func:`arcade:arcade.check_for_collision`.
+    """
+    a_left, a_bottom, a_right, a_top = a
+    b_left, b_bottom, b_right, b_top = b
+    return a_left < b_right and b_left < a_right and a_bottom < b_top and b_bottom < a_top
+
+def overlap_area(a, b):
+    """Returns the area of the overlap between two (left, bottom, right, top) boxes.
+    """
+    a_left, a_bottom, a_right, a_top = a
+    b_left, b_bottom, b_right, b_top = b
+    width = min(a_right, b_right) - max(a_left, b_left)
+    height = min(a_top, b_top) - max(a_bottom, b_bottom)
+    return max(width, 0) * max(height, 0)
+
+def translate_bounds(bounds, dx, dy):
+    """Returns a (left, bottom, right, top) box moved by (dx, dy).
+    """
+    left, bottom, right, top = bounds
+    return left + dx, bottom + dy, right + dx, top + dy
+
+def escape_candidates(bounds, obstacles):
+    """Returns (dx, dy) moves which might push `bounds` out of a group of obstacles.
+
+    A box which has just been pushed out of an obstacle has one of its edges lined up
+    with one of the obstacle's edges. So the candidates are all the moves which line up
+    a vertical edge of the box with a vertical edge of an obstacle, a horizontal edge
+    of the box with a horizontal edge of an obstacle, or both (this is how to get out of
+    an inside corner). The moves are sorted from shortest to longest. `bounds` is a
+    (left, bottom, right, top) box and `obstacles` is a list of them.
+    """
+    left, bottom, right, top = bounds
+    xs, ys = {0}, {0}
+    for o_left, o_bottom, o_right, o_top in obstacles:
+        xs.update((o_left - right, o_right - left))
+        ys.update((o_bottom - top, o_top - bottom))
+    moves = [(dx, dy) for dx in xs for dy in ys if dx or dy]
+    return sorted(moves, key=lambda move: abs(move[0]) + abs(move[1]))
+
+def swept_bounds(bounds, dx, dy):
+    """Returns the box covering `bounds` at both ends of a (dx, dy) move.
+    """
+    left, bottom, right, top = bounds
+    return min(left, left + dx), min(bottom, bottom + dy), max(right, right + dx), max(top, top + dy)
+
+def time_of_impact(bounds, dx, dy, obstacle):
+    """Finds when a moving box first hits an obstacle.
+
+    For each axis, we work out the fraction of the move at which the box starts to
+    overlap the obstacle along that axis (entry) and stops overlapping it (exit). The
+    box only overlaps the obstacle when it overlaps along both axes, so it hits at the
+    later of the two entry times, as long as that comes before the earlier exit time.
+
+    Arguments:
+        bounds: The moving (left, bottom, right, top) box, before it moves.
+        dx (float): Horizontal distance of the move.
+        dy (float): Vertical distance of the move.
+        obstacle: The obstacle's (left, bottom, right, top) box.
+
+    Returns:
+        The fraction of the move (between 0 and 1) completed when the box touches
+        the obstacle, or None if the move doesn't hit it. Boxes which already overlap
+        at the start of the move also return None.
+    """
+    entry, exit = float("-inf"), float("inf")
+    for low, high, o_low, o_high, d in ((bounds[0], bounds[2], obstacle[0], obstacle[2], dx),
+                                        (bounds[1], bounds[3], obstacle[1], obstacle[3], dy)):
+        if d > 0:
+            entry = max(entry, (o_low - high) / d)
+            exit = min(exit, (o_high - low) / d)
+        elif d < 0:
+            entry = max(entry, (o_high - low) / d)
+            exit = min(exit, (o_low - high) / d)
+        elif high <= o_low or o_high <= low:
+            return None
+    if entry >= exit or entry < 0 or entry >= 1:
+        return None
+    return entry
+
+class StaticSpatialHash:
+    """Indexes sprites which never move, so that nearby sprites can be found quickly.
+
+    The world is divided into a grid of square cells, and each sprite is stored in every
+    cell its bounding box touches. To find the sprites near a box, we only need to look in
+    the cells that box touches, instead of checking every sprite. Because the sprites are
+    assumed not to move, the index is built once; if the sprites change, build a new one.
+
+    Arguments:
+        sprites: The sprites to index, usually the game's `wall_list`.
+        cell_size (float): Width and height of each cell, in pixels. When None, the
+            median sprite dimension is used, so that most sprites fit in one or two cells.
+    """
+    default_cell_size = 32
+
+    def __init__(self, sprites, cell_size=None):
+        self.sprite_list = sprites
+        self.sprites = list(sprites)
+        self.bounds = [get_bounds(sprite) for sprite in self.sprites]
+        self.cell_size = cell_size or self.choose_cell_size()
+        self.cells = defaultdict(list)
+        for index, bounds in enumerate(self.bounds):
+            for cell in self.get_cells(bounds):
+                self.cells[cell].append(index)
+
+    def choose_cell_size(self):
+        """Picks a cell size matching a typical indexed sprite.
+        """
+        sizes = sorted(max(right - left, top - bottom) for left, bottom, right, top in self.bounds)
+        if not sizes:
+            return self.default_cell_size
+        return sizes[len(sizes) // 2] or self.default_cell_size
+
+    def get_cells(self, bounds):
+        """Returns the (x, y) coordinates of every cell touched by a bounding box.
+        """
+        left, bottom, right, top = bounds
+        size = self.cell_size
+        for x in range(floor(left / size), floor(right / size) + 1):
+            for y in range(floor(bottom / size), floor(top / size) + 1):
+                yield x, y
+
+    def query(self, bounds):
+        """Finds indexed sprites whose bounding boxes overlap `bounds`.
+
+        Arguments:
+            bounds: A (left, bottom, right, top) tuple, for example from :py:func:`get_bounds`.
+
+        Returns:
+            A list of sprites, in the same order as they were indexed.
+        """
+        return [self.sprites[i] for i in self.query_indices(bounds)]
+
+    def query_indices(self, bounds):
+        """Like :py:meth:`query`, but returns the sprites' positions in the index.
+        """
+        found = set()
+        for cell in self.get_cells(bounds):
+            found.update(self.cells.get(cell, ()))
+        return [i for i in sorted(found) if bounds_overlap(bounds, self.bounds[i])]
+
+    def overlap_area(self, bounds):
+        """Returns the total area of indexed bounding boxes overlapping `bounds`.
+        """
+        return sum(overlap_area(bounds, self.bounds[i]) for i in self.query_indices(bounds))
+
+    def query_sprite(self, sprite):
+        """Finds indexed sprites whose bounding boxes overlap the sprite's bounding box.
+        """
+        return self.query(get_bounds(sprite))
+
+    def __len__(self):
+        return len(self.sprites)
+
+def sweep_and_prune(sprites, group=None, can_pair=None, bounds=None):
+    """Finds pairs of sprites whose bounding boxes overlap.
+
+    Checking every pair of sprites takes time proportional to the square of the number
+    of sprites. Instead, we sort the sprites by their left edges and sweep from left to
+    right, keeping a list of "active" sprites whose right edges we have not yet passed.
+    Each new sprite only needs to be compared with the active sprites; everything else
+    is too far to the left to touch it.
+
+    Sprites can also be split into groups, where some groups never pair with each other
+    (for example, coins only need to be checked against the player, not against other
+    coins). Each group gets its own active list, and a new sprite is only compared with
+    the active lists of groups it can pair with.
+
+    Arguments:
+        sprites: A list of sprites.
+        group: Optional function returning a sprite's group. Groups must be hashable.
+        can_pair: Optional function taking two groups and returning whether sprites in
+            those groups can pair. When omitted, every group pairs with every group.
+        bounds: Optional list of the sprites' bounds, if they are already known.
+
+    Returns:
+        A list of (sprite0, sprite1) pairs, in the same order as
+        `itertools.combinations(sprites, 2)` would produce them.
+    """
+    if bounds is None:
+        bounds = [get_bounds(sprite) for sprite in sprites]
+    group_ids = {}
+    if group is None:
+        labels = [0] * len(sprites)
+        group_ids[None] = 0
+    else:
+        labels = [group_ids.setdefault(group(sprite), len(group_ids)) for sprite in sprites]
+    compatible = [
+        [can_pair is None or can_pair(group0, group1) for group1 in group_ids]
+        for group0 in group_ids
+    ]
+    pairs = []
+    active = [[] for group_id in group_ids]
+    for i in sorted(range(len(sprites)), key=lambda i: bounds[i][0]):
+        left = bounds[i][0]
+        for other_group, can_pair_with_group in enumerate(compatible[labels[i]]):
+            if not can_pair_with_group or not active[other_group]:
+                continue
+            active[other_group] = [j for j in active[other_group] if bounds[j][2] > left]
+            for j in active[other_group]:
+                if bounds_overlap(bounds[i], bounds[j]):
+                    pairs.append((min(i, j), max(i, j)))
+        active[labels[i]].append(i)
+    pairs.sort()
+    return [(sprites[i], sprites[j]) for i, j in pairs]
+
+class WallRectangle:
+    """A rectangle of wall tiles which is treated as a single obstacle.
+
+    Maps are often built from lots of identical wall tiles sitting next to each other.
+    A physics engine doesn't need to know about each tile separately: a long wall made
+    of twenty tiles can be checked for collisions as one rectangle. WallRectangle looks
+    enough like a sprite (it has a hit box) to be stored in a :py:class:`StaticSpatialHash`,
+    and keeps track of the tiles it covers so that the tiles a sprite actually touched can
+    be found when needed. See :py:func:`wall_rectangles`.
+
+    Arguments:
+        walls: A list of wall sprites, row by row from the bottom left.
+        indices: The position of each wall in the original wall list.
+        columns (int): Number of tiles across.
+        rows (int): Number of tiles up.
+        bounds: The (left, bottom, right, top) box covering all the tiles.
+        pitch (float, float): Distance between the centers of neighboring tiles.
+    """
+    def __init__(self, walls, indices, columns, rows, bounds, pitch):
+        self.walls = walls
+        self.indices = indices
+        self.columns = columns
+        self.rows = rows
+        self.left, self.bottom, self.right, self.top = bounds
+        self.pitch_x, self.pitch_y = pitch
+        self.center_x = (self.left + self.right) / 2
+        self.center_y = (self.bottom + self.top) / 2
+
+    @classmethod
+    def from_wall(cls, wall, index):
+        """Creates a WallRectangle covering a single wall.
+        """
+        return cls([wall], [index], 1, 1, get_bounds(wall), (wall.width, wall.height))
+
+    def get_adjusted_hit_box(self):
+        return [(self.left, self.bottom), (self.right, self.bottom), (self.right, self.top), (self.left, self.top)]
+
+    def walls_touching(self, bounds):
+        """Returns (index, wall) pairs for the tiles whose bounding boxes overlap or touch `bounds`.
+        """
+        left, bottom, right, top = bounds
+        min_column = max(0, floor((left - self.left) / self.pitch_x) - 1)
+        max_column = min(self.columns - 1, floor((right - self.left) / self.pitch_x))
+        min_row = max(0, floor((bottom - self.bottom) / self.pitch_y) - 1)
+        max_row = min(self.rows - 1, floor((top - self.bottom) / self.pitch_y))
+        touching = []
+        for row in range(min_row, max_row + 1):
+            for column in range(min_column, max_column + 1):
+                i = row * self.columns + column
+                w_left, w_bottom, w_right, w_top = get_bounds(self.walls[i])
+                if w_left <= right and left <= w_right and w_bottom <= top and bottom <= w_top:
+                    touching.append((self.indices[i], self.walls[i]))
+        return touching
+
+def wall_rectangles(walls, merge=True, max_gap=2):
+    """Builds collision geometry for a list of walls, merging neighboring tiles into rectangles.
+
+    First we look for walls which are laid out on a grid (like the tiles of a
+    :py:class:`TiledMap <quest.map.TiledMap>` or a :py:class:`GridMapLayer <quest.map.GridMapLayer>`)
+    and group together walls with the same size and hit box. Within each group, we
+    greedily merge tiles: starting from the bottom-left remaining tile, extend a run of
+    tiles to the right as far as possible, then extend the run upward, row by row, as long
+    as every tile in the next row is present. The tiles covered become one
+    :py:class:`WallRectangle`, and we repeat until every tile is covered.
+
+    Tiles are only merged if their hit boxes nearly fill their grid cells, so that filling
+    in the gaps between neighboring tiles (at most `max_gap` pixels) doesn't block paths
+    sprites could previously walk through. Walls which can't be merged get a rectangle
+    of their own.
+
+    Arguments:
+        walls: A list (or SpriteList) of wall sprites.
+        merge (bool): When False, every wall gets its own rectangle.
+        max_gap (float): The widest gap between neighboring tiles which may be filled in.
+
+    Returns:
+        A list of :py:class:`WallRectangle`.
+    """
+    rectangles = []
+    groups = defaultdict(dict)
+    for index, wall in enumerate(walls):
+        bounds = get_bounds(wall)
+        left, bottom, right, top = bounds
+        pitch_x, pitch_y = wall.width, wall.height
+        fills_cell = pitch_x > 0 and pitch_y > 0 and (
+                pitch_x - (right - left) <= max_gap and pitch_y - (top - bottom) <= max_gap)
+        if not merge or not fills_cell:
+            rectangles.append(WallRectangle.from_wall(wall, index))
+            continue
+        offset_x, offset_y = wall.center_x % pitch_x, wall.center_y % pitch_y
+        shape = tuple(round(b - c, 6) for b, c in zip(bounds, (wall.center_x, wall.center_y) * 2))
+        key = (pitch_x, pitch_y, round(offset_x, 6), round(offset_y, 6), shape)
+        cell = (round((wall.center_x - offset_x) / pitch_x), round((wall.center_y - offset_y) / pitch_y))
+        if cell in groups[key]:
+            rectangles.append(WallRectangle.from_wall(wall, index))
+        else:
+            groups[key][cell] = (index, wall, bounds)
+    for (pitch_x, pitch_y, offset_x, offset_y, shape), cells in groups.items():
+        merged = set()
+        for x, y in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+            if (x, y) in merged:
+                continue
+            columns = 1
+            while (x + columns, y) in cells and (x + columns, y) not in merged:
+                columns += 1
+            rows = 1
+            while all((x + i, y + rows) in cells and (x + i, y + rows) not in merged for i in range(columns)):
+                rows += 1
+            tiles = [cells[(x + i, y + j)] for j in range(rows) for i in range(columns)]
+            merged.update((x + i, y + j) for j in range(rows) for i in range(columns))
+            bounds = tiles[0][2][:2] + tiles[-1][2][2:]
+            rectangles.append(WallRectangle(
+                [wall for index, wall, b in tiles],
+                [index for index, wall, b in tiles],
+                columns,
+                rows,
+                bounds,
+                (pitch_x, pitch_y),
+            ))
+    return rectangles
+
+class OccupancyGrid:
+    """Keeps track of which sprites occupy each tile of a grid.
+
+    Tiles are (x, y) tuples of integers. Each tile inside the grid has a slot holding a
+    list of the sprites currently on it, so looking up or updating a tile takes the same
+    amount of time no matter how big the grid is or how many sprites there are. Which
+    tiles hold walls is also precomputed, in a boolean array. Sprites may also be outside
+    the grid; these are stored separately.
+
+    Arguments:
+        columns (int): Number of columns in the grid.
+        rows (int): Number of rows in the grid.
+    """
+    def __init__(self, columns, rows):
+        self.columns = int(columns)
+        self.rows = int(rows)
+        self.cells = [[] for i in range(self.columns * self.rows)]
+        self.wall_map = np.zeros((self.columns, self.rows), dtype=bool)
+        self.walls = defaultdict(list)
+        self.outside = defaultdict(list)
+
+    def in_grid(self, tile):
+        """Returns whether `tile` is within the grid.
+        """
+        x, y = tile
+        return 0 <= x < self.columns and 0 <= y < self.rows
+
+    def occupants(self, tile):
+        """Returns the list of sprites on `tile`.
+        """
+        x, y = tile
+        if 0 <= x < self.columns and 0 <= y < self.rows:
+            return self.cells[y * self.columns + x]
+        return self.outside[tile]
+
+    def add(self, sprite, tile, wall=False):
+        """Places a sprite on a tile. If `wall` is True, the tile is marked as a wall.
+        """
+        self.occupants(tile).append(sprite)
+        if wall and self.in_grid(tile):
+            self.wall_map[tile] = True
+            self.walls[tile].append(sprite)
+
+    def remove(self, sprite, tile):
+        """Removes a sprite from a tile.
+        """
+        self.occupants(tile).remove(sprite)
+
+    def move(self, sprite, origin, destination):
+        """Moves a sprite from one tile to another.
+        """
+        self.remove(sprite, origin)
+        self.occupants(destination).append(sprite)
+
+    def get_wall(self, tile):
+        """Returns the wall on `tile`, or None if there is no wall.
+
+        A wall which has been removed from all its sprite lists (for example
+        using `kill()`) no longer counts.
+        """
+        if not self.in_grid(tile) or not self.wall_map[tile]:
+            return None
+        walls = self.walls[tile]
+        while walls and not walls[0].sprite_lists:
+            walls.pop(0)
+        if not walls:
+            self.wall_map[tile] = False
+            return None
+        return walls[0]
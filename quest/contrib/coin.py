@@ -1,7 +1,7 @@
 # coin.py
 # by Jacob Wolf
 
-from quest.sprite import NPC
+from quest.sprite import NPC, CollisionCategory
 from quest.helpers import resolve_resource_path
 from arcade import check_for_collision_with_list
 from random import randint
@@ -47,6 +47,8 @@ class Coin(NPC):
     """A coin to be collected by the player
     """
     description = "coin"
+    collision_category = CollisionCategory.ITEM
+    collision_mask = CollisionCategory.PLAYER
 
     def __init__(self):
         super().__init__(resolve_resource_path("images/items/coin.png"), .1)
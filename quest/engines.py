@@ -1,11 +1,21 @@
 import arcade
 from arcade.sprite_list import SpriteList, check_for_collision
-from arcade import check_for_collision_with_list
 from itertools import chain, combinations
-from collections import defaultdict
 from easing_functions import LinearInOut
-from quest.helpers import Direction, SpriteListList, scale
-from time import time
+from quest.helpers import Direction, SpriteListList
+from quest.collisions import (
+    StaticSpatialHash,
+    sweep_and_prune,
+    get_bounds,
+    escape_candidates,
+    translate_bounds,
+    swept_bounds,
+    time_of_impact,
+    wall_rectangles,
+    OccupancyGrid,
+)
+from quest.clock import WallClock
+from quest.sprite import get_collision_filter, filters_collide, can_collide
 from math import sqrt
 
 class QuestPhysicsEngine:
@@ -46,28 +56,177 @@ class QuestPhysicsEngine:
 class ContinuousPhysicsEngine(QuestPhysicsEngine):
     """A continuous physics engine allows sprites to be at any point.
 
-    This implementation is simple but inefficient. It may be problematic with
-    more complex games. If we run into trouble, first try using spatial hashes
-    to resolve collisions.
+    Walls never move, so when the engine is created it indexes them in a
+    :py:class:`StaticSpatialHash <quest.collisions.StaticSpatialHash>`. Then each
+    moving sprite only needs to be checked against the walls near it, instead of
+    against every wall on the map. If the game's `wall_list` is replaced (for
+    example, when switching maps) or walls are added or removed, the index is
+    rebuilt on the next update.
+
+    Before indexing, neighboring wall tiles are merged into larger rectangles (see
+    :py:func:`wall_rectangles <quest.collisions.wall_rectangles>`). A maze wall made of
+    twenty tiles is then a single candidate for collisions instead of twenty. The tiles
+    themselves are still drawn as usual, and `on_collision` is still called with the
+    individual wall tiles a sprite touches.
+
+    Similarly, rather than checking every pair of players and NPCs for collisions,
+    the engine uses :py:func:`sweep_and_prune <quest.collisions.sweep_and_prune>` to
+    find the pairs which are close enough that they might be colliding.
+
+    Many NPCs never move (for example, items waiting to be collected). When `sleep_after`
+    is set, a sprite without a strategy or a velocity whose position hasn't changed for
+    `sleep_after` updates falls asleep: the engine remembers where it is and stops checking
+    it against other sleeping sprites. A sleeping sprite wakes up as soon as it gets a
+    velocity, is moved (by the engine or by your code), or something collides with it.
+    Sprites which touched another sprite during the last update don't fall asleep, so
+    sprites which stay in contact keep getting `on_collision` calls, just as if they were
+    awake. Sleeping is off by default.
+
+    Attributes:
+        wall_cell_size: Size (in pixels) of the cells in the wall index. When None,
+            a typical wall size is used.
+        merge_walls: Whether to merge neighboring wall tiles into rectangles. Default True.
+        pair_broadphase: How to find pairs of players and NPCs which might be colliding.
+            "sweep" (default) uses sweep and prune; "exhaustive" checks every pair,
+            which is slower but can be useful for comparison.
+        swept_collisions: When True, fast sprites are checked for walls along their
+            whole path, so they can't pass through walls (see :py:meth:`move_swept`).
+            Default False.
+        sleep_after: The number of updates a sprite must stay still before it falls
+            asleep. When None, sprites never sleep. Default None.
     """
+    wall_cell_size = None
+    merge_walls = True
+    pair_broadphase = "sweep"
+    swept_collisions = False
+    sleep_after = None
+
     def __init__(self, game, **kwargs):
         super().__init__(game, **kwargs)
         self.non_wall_list = SpriteListList([self.player_list, self.npc_list])
+        self.build_wall_index()
+
+    def build_wall_index(self):
+        """Indexes the game's walls so that nearby walls can be found quickly.
+        """
+        self.wall_list = self.game.wall_list
+        self.wall_count = len(self.wall_list)
+        self.wall_version = getattr(self.wall_list, "version", None)
+        self.wall_geometry = wall_rectangles(self.wall_list, merge=self.merge_walls)
+        self.wall_index = StaticSpatialHash(self.wall_geometry, self.wall_cell_size)
+
+    def walls_changed(self):
+        """Checks whether the game's walls have changed since they were indexed.
+
+        This is a cheap check, which notices when the game's `wall_list` is replaced
+        (for example when the game switches maps) or when walls are added or removed.
+        If the wall list is a :py:class:`QuestSpriteList <quest.helpers.QuestSpriteList>`,
+        its `version` is checked too, so that adding and removing the same number of
+        walls is noticed.
+        """
+        return (self.game.wall_list is not self.wall_list or len(self.wall_list) != self.wall_count
+                or getattr(self.wall_list, "version", None) != self.wall_version)
 
     def update(self):
         """Updates sprite positions and handles collisions.
         """
         super().update(self.game)
+        if self.walls_changed():
+            self.build_wall_index()
+        self.update_sleep_states()
         self.update_sprite_positions()
         self.resolve_collisions_with_walls()
         self.resolve_collisions_between_nonwalls()
 
+    def update_sleep_states(self):
+        """Wakes sprites which have started moving, and puts idle sprites to sleep.
+
+        A sprite is idle when its position is the same as at the start of the last update,
+        so sprites moved by collisions or by other code count as moving. Sprites which
+        collided with another sprite during the last update (see
+        :py:meth:`resolve_collisions_between_nonwalls`) stay awake. So do new sprites,
+        until they have been checked for collisions once.
+        """
+        if self.sleep_after is None:
+            return
+        for sprite in self.non_wall_list:
+            in_contact = getattr(sprite, "in_contact", True)
+            sprite.in_contact = False
+            position = sprite.position
+            moved = position != getattr(sprite, "last_position", None)
+            sprite.last_position = position
+            if moved or in_contact or sprite.change_x or sprite.change_y or getattr(sprite, "strategy", None):
+                self.wake(sprite)
+            elif not sprite.asleep:
+                sprite.idle_ticks += 1
+                if sprite.idle_ticks >= self.sleep_after:
+                    self.fall_asleep(sprite)
+
+    def fall_asleep(self, sprite):
+        """Puts a sprite to sleep, remembering its bounds.
+        """
+        sprite.asleep = True
+        sprite.sleep_bounds = get_bounds(sprite)
+
+    def wake(self, sprite):
+        """Wakes a sprite up and resets its count of idle updates.
+        """
+        sprite.asleep = False
+        sprite.idle_ticks = 0
+
     def update_sprite_positions(self):
         """Updates sprite positions using their `change_x` and `change_y` attributes.
         """
         for moving_sprite in self.non_wall_list:
-            moving_sprite.center_x += moving_sprite.change_x
-            moving_sprite.center_y += moving_sprite.change_y
+            if not (moving_sprite.change_x or moving_sprite.change_y):
+                continue
+            if self.swept_collisions and self.is_fast(moving_sprite):
+                self.move_swept(moving_sprite)
+            else:
+                moving_sprite.position = (
+                    moving_sprite.center_x + moving_sprite.change_x,
+                    moving_sprite.center_y + moving_sprite.change_y,
+                )
+
+    def is_fast(self, sprite):
+        """Returns whether the sprite moves more than half its own size in one update.
+
+        Slower sprites can't jump over a wall in one update, so they don't need
+        to be swept.
+        """
+        return abs(sprite.change_x) * 2 > sprite.width or abs(sprite.change_y) * 2 > sprite.height
+
+    def move_swept(self, sprite):
+        """Moves the sprite, stopping it at the first wall along its path.
+
+        Normally sprites jump straight to their new position and then check whether
+        they overlap a wall. A sprite moving faster than a wall is thick could jump right
+        over it. Instead, we find every wall near the sprite's path and calculate when
+        the sprite would first touch each one (see
+        :py:func:`time_of_impact <quest.collisions.time_of_impact>`). If it hits a wall,
+        the sprite moves only as far as that wall, collides with it, and stops. (Rounding
+        can leave the sprite overlapping the wall by a tiny amount, so it is also pushed
+        out of any walls it overlaps.)
+        """
+        dx, dy = sprite.change_x, sprite.change_y
+        bounds = get_bounds(sprite)
+        first_impact, first_rectangle = None, None
+        for i in self.wall_index.query_indices(swept_bounds(bounds, dx, dy)):
+            impact = time_of_impact(bounds, dx, dy, self.wall_index.bounds[i])
+            if impact is not None and (first_impact is None or impact < first_impact):
+                first_impact, first_rectangle = impact, self.wall_index.sprites[i]
+        if first_rectangle is None:
+            sprite.center_x += dx
+            sprite.center_y += dy
+        else:
+            sprite.center_x += dx * first_impact
+            sprite.center_y += dy * first_impact
+            touching = first_rectangle.walls_touching(get_bounds(sprite))
+            first_wall = touching[0][1] if touching else first_rectangle.walls[0]
+            sprite.on_collision(first_wall, self.game)
+            first_wall.on_collision(sprite, self.game)
+            self.resolve_sprite_wall_collisions(sprite, self.wall_index.query_sprite(sprite),
+                    (dx * first_impact, dy * first_impact))
 
     def resolve_collisions_with_walls(self):
         """Resolves collisions between every sprite and every wall.
@@ -76,37 +235,122 @@ class ContinuousPhysicsEngine(QuestPhysicsEngine):
         for moving_sprite in self.non_wall_list:
             if moving_sprite.change_x == 0 and moving_sprite.change_y == 0:
                 continue
-            wall_collisions = check_for_collision_with_list(moving_sprite, self.wall_list)
+            wall_collisions = self.get_wall_collisions(moving_sprite)
             for wall in wall_collisions:
                 moving_sprite.on_collision(wall, self.game)
                 wall.on_collision(moving_sprite, self.game)
-                self.resolve_sprite_wall_collision(moving_sprite, wall)
+            if wall_collisions:
+                self.resolve_sprite_wall_collisions(moving_sprite, wall_collisions)
+
+    def get_wall_collisions(self, sprite):
+        """Returns a list of walls colliding with the sprite.
+
+        The wall index narrows the search down to wall rectangles whose bounding boxes
+        overlap the sprite's; only the tiles of these rectangles near the sprite are
+        checked precisely. Walls are returned in the same order as in `wall_list`.
+        """
+        bounds = get_bounds(sprite)
+        collisions = []
+        for rectangle in self.wall_index.query(bounds):
+            for index, wall in rectangle.walls_touching(bounds):
+                if check_for_collision(sprite, wall):
+                    collisions.append((index, wall))
+        return [wall for index, wall in sorted(collisions, key=lambda collision: collision[0])]
 
     def resolve_sprite_wall_collision(self, sprite, wall):
-        """Stops the sprite and backs it away from the wall until they are no longer colliding.
+        """Stops the sprite and pushes it out of the wall.
 
-        The distance by which the sprite backs up doubles until they are no longer colliding.
-        Note that this does not handle the case in which backing away from one wall means
-        it hits another wall (e.g. in a narrow passageway). This will be handled on the subsequent
-        update. We can write more complex code if it becomes necessary.
+        See :py:meth:`resolve_sprite_wall_collisions`.
         """
+        self.resolve_sprite_wall_collisions(sprite, [wall])
+
+    def resolve_sprite_wall_collisions(self, sprite, walls, move=None):
+        """Stops the sprite and pushes it out of all the walls it overlaps.
+
+        The sprite and walls are treated as rectangles (their bounding boxes). We look at
+        the ways the sprite could be pushed so that it lines up with the edges of nearby
+        walls (see :py:func:`escape_candidates <quest.collisions.escape_candidates>`), and
+        take the shortest one which leaves the sprite out of every wall. This works when
+        the sprite has just bumped into a wall, and also when it was already stuck in one
+        (for example in an inside corner, where it needs to be pushed out sideways and
+        upward at once). The sprite is never pushed farther than its own size, so it can't
+        be pushed right through a wall. If there's no way out that close (for example when
+        the sprite is pushing into an inside corner), its move is undone instead. A sprite
+        which is only touching a wall (for example after :py:meth:`move_swept`) is left
+        where it is.
+
+        Arguments:
+            sprite: The sprite.
+            walls: The walls the sprite overlaps.
+            move: The (dx, dy) the sprite moved this update. Defaults to its velocity.
+        """
+        move_x, move_y = move or (sprite.change_x, sprite.change_y)
         sprite.stop()
-        repel_distance = 1
-        away = (wall.center_x - sprite.center_x, wall.center_y - sprite.center_y)
-        while check_for_collision(sprite, wall):
-            away_x, away_y = scale(away, repel_distance)
-            sprite.center_x = sprite.center_x - away_x
-            sprite.center_y = sprite.center_y - away_y
-            repel_distance *= 2
+        left, bottom, right, top = bounds = get_bounds(sprite)
+        if not self.wall_index.query_indices(bounds):
+            return
+        limit = max(sprite.width, sprite.height)
+        nearby = (left - limit, bottom - limit, right + limit, top + limit)
+        obstacles = [get_bounds(wall) for wall in walls]
+        obstacles += [self.wall_index.bounds[i] for i in self.wall_index.query_indices(nearby)]
+        escape_x, escape_y = -move_x, -move_y
+        for dx, dy in escape_candidates(bounds, obstacles):
+            if abs(dx) + abs(dy) > limit:
+                break
+            if not self.wall_index.query_indices(translate_bounds(bounds, dx, dy)):
+                escape_x, escape_y = dx, dy
+                break
+        sprite.center_x += escape_x
+        sprite.center_y += escape_y
 
     def resolve_collisions_between_nonwalls(self):
         """For every pair of nonwall sprites, resolves collisions.
+
+        Pairs of sprites whose collision categories and masks don't match (see
+        :py:class:`CollisionCategory <quest.sprite.CollisionCategory>`) are never checked,
+        and neither are pairs of sleeping sprites. Sprites which collide are woken up, and
+        are marked as `in_contact` so that they don't fall asleep during the next update.
         """
-        for sprite0, sprite1 in combinations(self.non_wall_list, 2):
+        for sprite0, sprite1 in self.get_nonwall_pairs():
             if check_for_collision(sprite0, sprite1):
+                self.wake(sprite0)
+                self.wake(sprite1)
+                sprite0.in_contact = sprite1.in_contact = True
                 sprite0.on_collision(sprite1, self.game)
                 sprite1.on_collision(sprite0, self.game)
 
+    def get_pair_group(self, sprite):
+        """Returns a sprite's collision filter and whether it is asleep.
+
+        Sprites are grouped this way when looking for pairs (see :py:meth:`groups_can_pair`).
+        """
+        return get_collision_filter(sprite), getattr(sprite, "asleep", False)
+
+    @staticmethod
+    def groups_can_pair(group0, group1):
+        """Returns whether sprites in two pair groups need to be checked for collisions.
+        """
+        filter0, asleep0 = group0
+        filter1, asleep1 = group1
+        return not (asleep0 and asleep1) and filters_collide(filter0, filter1)
+
+    def get_nonwall_pairs(self):
+        """Returns pairs of nonwall sprites which might be colliding, using `pair_broadphase`.
+        """
+        sprites = self.non_wall_list.sprites()
+        if self.pair_broadphase == "sweep":
+            bounds = [
+                sprite.sleep_bounds if getattr(sprite, "asleep", False) else get_bounds(sprite)
+                for sprite in sprites
+            ]
+            return sweep_and_prune(sprites, self.get_pair_group, self.groups_can_pair, bounds)
+        elif self.pair_broadphase == "exhaustive":
+            groups = [self.get_pair_group(sprite) for sprite in sprites]
+            return [(sprites[i], sprites[j]) for i, j in combinations(range(len(sprites)), 2)
+                    if self.groups_can_pair(groups[i], groups[j])]
+        else:
+            raise ValueError("Unknown pair_broadphase: {}".format(self.pair_broadphase))
+
 class DiscretePhysicsEngine(QuestPhysicsEngine):
     """A physics engine which snaps sprite movement to specific gridpoints.
 
@@ -117,18 +361,33 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
     sprite movement in a discrete way, while animating sprites' transitions
     from tile to tile.
 
+    The engine keeps track of which sprites are on each tile using an
+    :py:class:`OccupancyGrid <quest.collisions.OccupancyGrid>`, so checking whether
+    a sprite can move onto a tile takes the same time no matter how many walls
+    or sprites there are.
+
+    Tile transitions are timed using the game's clock (see :py:class:`quest.clock.Clock`),
+    so when a game is simulated faster than real time, sprites still take the same
+    number of ticks to move from tile to tile.
+
     Args:
-        player_sprite (arcade.Sprite):
-        dynamic_sprite_lists (bool): Whether new sprites might be added
+        game (QuestGame): The game to which the engine will be attached.
+        grid_map_layer (GridMapLayer): The grid sprites move on.
+        diagonal (bool): Whether sprites may move diagonally. Default True.
+        check_for_new_sprites (bool): Whether new sprites might be added
             to sprite lists during the game. Performance is better when
             False. Default True.
+        clock (Clock): The clock used to time movement. Defaults to the game's
+            clock, or to a :py:class:`WallClock <quest.clock.WallClock>` if the
+            game doesn't have one.
     """
 
     tile_transition_cutoff = 0.5
     easing_class = LinearInOut
 
-    def __init__(self, game, grid_map_layer, diagonal=True, check_for_new_sprites=True, **kwargs):
+    def __init__(self, game, grid_map_layer, diagonal=True, check_for_new_sprites=True, clock=None, **kwargs):
         super().__init__(game, **kwargs)
+        self.clock = clock or getattr(game, "clock", None) or WallClock()
         self.grid = grid_map_layer
         self.diagonal = diagonal
         self.easing = self.easing_class()
@@ -136,10 +395,8 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
         sprite_lists = [self.player_list, self.wall_list, self.npc_list]
         self.all_nonbackground_sprites = SpriteListList(sprite_lists)
         self.dynamic_sprites = SpriteListList([l for l in sprite_lists if not l.is_static])
+        self.occupancy = OccupancyGrid(self.grid.columns, self.grid.rows)
         self.ensure_sprite_metadata(all_sprites=True)
-        self.tile_positions = defaultdict(list)
-        for sprite in self.all_nonbackground_sprites:
-            self.tile_positions[sprite.current_tile].append(sprite)
 
     def update(self):
         super().update(self.game)
@@ -157,13 +414,13 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
         vx, vy = direction.to_vector()
         destination = (ox + vx, oy + vy)
         if self.grid.position_in_grid(destination):
-            wall = self.get_wall(self.tile_positions[destination])
+            wall = self.get_wall(destination)
             if wall:
                 self.player().on_collision(wall, self.game)
                 wall.on_collision(self.player(), self.game)
             else:
                 sprite.moving = True
-                sprite.move_start = time()
+                sprite.move_start = self.clock.time()
                 sprite.t = 0
                 sprite.move_direction = direction
                 sprite.destination_tile = destination
@@ -172,14 +429,19 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
         duration = 1 / sprite.speed
         if sprite.move_direction.is_diagonal():
             duration *= sqrt(2)
-        sprite.t = self.ease((time() - sprite.move_start) / duration)
+        sprite.t = self.ease((self.clock.time() - sprite.move_start) / duration)
         if sprite.t >= self.tile_transition_cutoff:
-            self.tile_positions[sprite.current_tile].remove(sprite)
+            origin = sprite.current_tile
             sprite.current_tile = sprite.destination_tile
-            for other_sprite in self.tile_positions[sprite.current_tile]:
+            walls = self.occupancy.walls.get(sprite.current_tile, ())
+            for other_sprite in self.occupancy.occupants(sprite.current_tile):
+                if other_sprite is sprite:
+                    continue
+                if other_sprite not in walls and not can_collide(sprite, other_sprite):
+                    continue
                 sprite.on_collision(other_sprite, self.game)
                 other_sprite.on_collision(sprite, self.game)
-            self.tile_positions[sprite.current_tile].append(sprite)
+            self.occupancy.move(sprite, origin, sprite.current_tile)
         if sprite.t >= 1.0:
             self.end_move(sprite)
         else:
@@ -192,10 +454,16 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
         sprite.center_x, sprite.center_y = self.grid.get_pixel_position(sprite.destination_tile)
         sprite.origin_tile = sprite.current_tile = sprite.destination_tile
 
-    def get_wall(self, sprite_list):
-        for sprite in sprite_list:
-            if sprite in self.wall_list:
-                return sprite
+    def get_wall(self, tile):
+        """Returns the wall on `tile`, or None if there is no wall.
+        """
+        return self.occupancy.get_wall(tile)
+
+    def get_tile(self, sprite):
+        """Returns the (x, y) grid tile containing the sprite's center, as integers.
+        """
+        grid_x, grid_y = self.grid.get_grid_position((sprite.center_x, sprite.center_y))
+        return int(grid_x), int(grid_y)
 
     def interpolate(self, p0, p1, t):
         (x0, y0), (x1, y1) = p0, p1
@@ -205,12 +473,27 @@ class DiscretePhysicsEngine(QuestPhysicsEngine):
         return self.easing.ease(x)
 
     def ensure_sprite_metadata(self, all_sprites=False):
-        sprites = self.all_nonbackground_sprites if all_sprites else self.dynamic_sprites
-        for sprite in sprites:
-            if not hasattr(sprite, 'current_tile'):
-                sprite.origin_tile = self.grid.get_grid_position((sprite.center_x, sprite.center_y))
-                sprite.current_tile = sprite.origin_tile
-                sprite.destination_tile = None
-                sprite.move_start = None
-                sprite.moving = False
-                sprite.t = None
+        """Sets up tile metadata for sprites which don't have it yet, and places them on the grid.
+
+        When `all_sprites` is True, every sprite is placed on the grid, including sprites
+        which already have metadata.
+        """
+        sprite_lists = self.all_nonbackground_sprites if all_sprites else self.dynamic_sprites
+        for sprite_list in sprite_lists.sprite_lists:
+            is_wall = sprite_list is self.wall_list
+            for sprite in sprite_list:
+                if not hasattr(sprite, 'current_tile'):
+                    self.add_sprite_metadata(sprite)
+                elif not all_sprites:
+                    continue
+                self.occupancy.add(sprite, sprite.current_tile, wall=is_wall)
+
+    def add_sprite_metadata(self, sprite):
+        """Adds the attributes the engine uses to keep track of a sprite's movement.
+        """
+        sprite.origin_tile = self.get_tile(sprite)
+        sprite.current_tile = sprite.origin_tile
+        sprite.destination_tile = None
+        sprite.move_start = None
+        sprite.moving = False
+        sprite.t = None
@@ -1,7 +1,7 @@
 from quest.examples.island import IslandAdventure
 from quest.sprite import Player
 from quest.contrib.hit_points import HitPointsMixin
-import arcade
+from quest.helpers import QuestSpriteList
 
 class MortalPlayer(HitPointsMixin, Player):
     """MortalPlayer uses `HitPointsMixin` to add hit point
@@ -32,7 +32,7 @@ class DangerousIsland(IslandAdventure):
         self.player.center_x = self.player_initial_x
         self.player.center_y = self.player_initial_y
         self.player.speed = self.player_speed
-        self.player_list = arcade.SpriteList()
+        self.player_list = QuestSpriteList()
         self.player_list.append(self.player)
 
     def message(self):
@@ -3,10 +3,9 @@ from quest.map import TiledMap
 from quest.dialogue import Dialogue
 from quest.modal import Modal, DialogueModal
 from quest.sprite import QuestSprite, Player, Wall, NPC
-from quest.helpers import scale, resolve_resource_path
+from quest.helpers import scale, resolve_resource_path, QuestSpriteList
 from quest.strategy import RandomWalk
 from quest.contrib.inventory import InventoryMixin, InventoryItemMixin
-import arcade
 import os
 from pathlib import Path
 
@@ -52,7 +51,7 @@ class GrandmasSoupWithInventory(InventoryMixin, QuestGame):
             [Potatoes, "images/items/potatoes.png", 1, 959, 991],
             [Tomatos, "images/items/tomatos.png", 1, 323, 1055],
         ]
-        self.npc_list = arcade.SpriteList()
+        self.npc_list = QuestSpriteList()
         for sprite_class, image, scale, x, y in npc_data:
             sprite = sprite_class(resolve_resource_path(image), scale)
             sprite.center_x = x
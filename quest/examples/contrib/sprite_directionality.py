@@ -7,9 +7,8 @@
 from quest.sprite import Player
 from quest.examples.grandmas_soup import GrandmasSoupGame, Grandma, Carrots, Mushroom, Potatoes, Tomatos
 from quest.contrib.sprite_directionality import SpriteDirectionMixin
-from quest.helpers import scale, resolve_resource_path
+from quest.helpers import scale, resolve_resource_path, QuestSpriteList
 from quest.strategy import RandomWalk
-import arcade
 
 class DirectionalPlayer(SpriteDirectionMixin, Player):
     """ Uses the SpriteDirectionMixin to make the player sprite face different directions
@@ -39,7 +38,7 @@ class DirectionalGame(GrandmasSoupGame):
         self.player.center_x = self.player_initial_x
         self.player.center_y = self.player_initial_y
         self.player.speed = self.player_speed
-        self.player_list = arcade.SpriteList()
+        self.player_list = QuestSpriteList()
         self.player_list.append(self.player)
 
     def setup_npcs(self):
@@ -51,7 +50,7 @@ class DirectionalGame(GrandmasSoupGame):
             [Potatoes, "images/items/potatoes.png", 1, 959, 991],
             [Tomatos, "images/items/tomatos.png", 1, 323, 1055],
         ]
-        self.npc_list = arcade.SpriteList()
+        self.npc_list = QuestSpriteList()
         grandma_image = resolve_resource_path("images/people/grandma.png")
         grandma = DirectionalGrandma(grandma_image, grandma_image, grandma_image, 3)
         grandma.center_x = 400
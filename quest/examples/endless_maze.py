@@ -0,0 +1,156 @@
+from quest.game import QuestGame
+from quest.map import Map, GridMapLayer
+from quest.maze import StreamingMaze
+from quest.sprite import Wall
+from quest.helpers import resolve_resource_path
+from math import floor
+
+class EndlessMazeGame(QuestGame):
+    """How high can you climb? The maze never ends.
+
+    :py:class:`EndlessMazeGame` is like :py:class:`MazeGame <quest.examples.maze.MazeGame>`,
+    except that the maze goes on forever upward. Of course, the computer can't store a
+    maze that goes on forever. Instead, the maze is generated a row at a time, just before
+    the player can see it, and rows far below the player are thrown away. See
+    :py:class:`EndlessMazeMap` below.
+
+    To run this example::
+
+        $ python -m quest.examples.endless_maze
+
+    Attributes:
+        tile_size=32: Each square tile in the map is 32 pixels across.
+        grid_columns=21: The maze will have 21 columns of tiles.
+        rows_ahead=10: How many rows above the top of the screen should have walls.
+        rows_behind=10: How many rows below the bottom of the screen should have walls.
+        best_row=0: The highest row the player has reached.
+        maze_seed=None: If set, the maze will be the same every time.
+    """
+    tile_size = 32
+    grid_columns = 21
+    rows_ahead = 10
+    rows_behind = 10
+    player_sprite_image = resolve_resource_path("images/boy_simple.png")
+    player_scaling = 0.5
+    player_speed = 5
+    player_initial_x = 1.5 * tile_size
+    player_initial_y = 1.5 * tile_size
+    best_row = 0
+    maze_seed = None
+
+    def setup_maps(self):
+        """Creates an :py:class:`EndlessMazeMap` and adds it to the game's list of maps.
+        """
+        super().setup_maps()
+        maze_map = EndlessMazeMap(self.grid_columns, self.tile_size, self.rows_ahead, self.rows_behind,
+                self.maze_seed)
+        self.add_map(maze_map)
+
+    def setup_walls(self):
+        """Assigns `self.wall_list` to be all the sprites in the map's "walls" layer.
+        """
+        self.wall_list = self.get_current_map().get_layer_by_name("walls").sprite_list
+
+    def scroll_viewport(self):
+        """Scrolls the viewport as usual, and then tells the map where the viewport is,
+        so that it can add and remove rows of walls.
+        """
+        super().scroll_viewport()
+        self.get_current_map().update_rows(self.view_bottom, self.view_bottom + self.screen_height)
+        self.best_row = max(self.best_row, floor(self.player.center_y / self.tile_size))
+
+    def message(self):
+        """Returns a string like "Height 12"
+        """
+        return "Height {}".format(self.best_row)
+
+class EndlessMazeMap(Map):
+    """A Map whose walls come from a :py:class:`StreamingMaze <quest.maze.StreamingMaze>`.
+
+    Only rows near the viewport have wall sprites. Each time the viewport moves,
+    :py:meth:`update_rows` adds sprites for rows which have come within `rows_ahead`
+    rows of the viewport, and removes sprites (and the maze's memory of them) for rows
+    which are more than `rows_behind` rows below it. So however far the player goes,
+    the map only holds a few screens' worth of walls. Once a row is removed it can't
+    come back, so the lowest remaining row is filled in with walls to keep the player
+    from walking off the bottom of the maze, and the lowest row of passages above it is
+    opened up (see :py:meth:`StreamingMaze.drop_rows <quest.maze.StreamingMaze.drop_rows>`)
+    so that the player can't get trapped.
+
+    Args:
+        columns: The number of columns of tiles in the map.
+        tile_size: The size (in pixels) of each square tile.
+        rows_ahead: How many rows above the viewport should have walls.
+        rows_behind: How many rows below the viewport should have walls.
+        seed: Random seed to pass to the maze.
+    """
+    def __init__(self, columns, tile_size, rows_ahead=10, rows_behind=10, seed=None):
+        super().__init__()
+        self.columns = columns
+        self.tile_size = tile_size
+        self.rows_ahead = rows_ahead
+        self.rows_behind = rows_behind
+        self.maze = StreamingMaze(columns, seed)
+        self.background_color = (20,80,20)
+        self.add_layer(self.get_wall_map_layer())
+        self.row_sprites = {}
+        self.floor_sprites = []
+        self.bottom_row = 0
+        self.top_row = -1
+        self.update_rows(0, 0)
+
+    def get_wall_map_layer(self):
+        """Creates a new :py:class:`GridMapLayer` to hold walls.
+
+        The grid is only used to work out where wall sprites go, so it is given a
+        single row; grid rows above it just keep going upward.
+        """
+        return GridMapLayer(
+            name="walls",
+            columns=self.columns,
+            rows=1,
+            pixel_width=self.columns * self.tile_size,
+            pixel_height=self.tile_size,
+            sprite_filename=resolve_resource_path("images/box.png"),
+            sprite_class=Wall,
+        )
+
+    def update_rows(self, view_bottom, view_top):
+        """Adds and removes rows of wall sprites so that there are walls from `rows_behind`
+        rows below the viewport to `rows_ahead` rows above it.
+
+        Args:
+            view_bottom: The bottom of the viewport, in pixels.
+            view_top: The top of the viewport, in pixels.
+        """
+        wall_map_layer = self.get_layer_by_name("walls")
+        top = floor(view_top / self.tile_size) + self.rows_ahead
+        bottom = max(floor(view_bottom / self.tile_size) - self.rows_behind, self.bottom_row)
+        for y in range(self.top_row + 1, top + 1):
+            self.row_sprites[y] = wall_map_layer.add_sprites(self.maze.get_walls(y, y))
+        self.top_row = max(self.top_row, top)
+        if bottom > self.bottom_row:
+            for y in range(self.bottom_row, bottom):
+                for sprite in self.row_sprites.pop(y, []):
+                    sprite.remove_from_sprite_lists()
+            opened_row = self.maze.drop_rows(bottom)
+            for sprite in self.row_sprites.pop(opened_row, []):
+                sprite.remove_from_sprite_lists()
+            if opened_row <= self.top_row:
+                self.row_sprites[opened_row] = wall_map_layer.add_sprites(
+                    self.maze.get_walls(opened_row, opened_row))
+            self.bottom_row = bottom
+            self.fill_bottom_row(wall_map_layer)
+
+    def fill_bottom_row(self, wall_map_layer):
+        """Replaces the walls filling in the gaps in the lowest row.
+        """
+        for sprite in self.floor_sprites:
+            sprite.remove_from_sprite_lists()
+        wall_row = self.maze.get_wall_row(self.bottom_row)
+        gaps = [(x, self.bottom_row) for x, wall in enumerate(wall_row) if not wall]
+        self.floor_sprites = wall_map_layer.add_sprites(gaps)
+
+if __name__ == '__main__':
+    game = EndlessMazeGame()
+    game.run()
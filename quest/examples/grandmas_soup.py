@@ -2,10 +2,9 @@ from quest.game import QuestGame
 from quest.map import TiledMap
 from quest.dialogue import Dialogue
 from quest.modal import Modal, DialogueModal
-from quest.sprite import QuestSprite, Player, Wall, NPC
-from quest.helpers import scale, resolve_resource_path
+from quest.sprite import QuestSprite, Player, Wall, NPC, CollisionCategory
+from quest.helpers import scale, resolve_resource_path, QuestSpriteList
 from quest.strategy import RandomWalk
-import arcade
 import os
 from pathlib import Path
 
@@ -70,7 +69,7 @@ class GrandmasSoupGame(QuestGame):
             [Potatoes, "images/items/potatoes.png", 1, 959, 991],
             [Tomatoes, "images/items/tomatos.png", 1, 323, 1055],
         ]
-        self.npc_list = arcade.SpriteList()
+        self.npc_list = QuestSpriteList()
         for sprite_class, image, scale, x, y in npc_data:
             sprite = sprite_class(resolve_resource_path(image), scale)
             sprite.center_x = x
@@ -132,6 +131,8 @@ class Vegetable(NPC):
     """A vegetable is an NPC that can be picked up.
     """
     description = "item"
+    collision_category = CollisionCategory.ITEM
+    collision_mask = CollisionCategory.PLAYER
     def on_collision(self, sprite, game):
         """When the player collides with a vegetable, it tells the game and then
         kills itself.
@@ -35,13 +35,15 @@ class IslandAdventure(QuestGame):
 
         Uses a :py:class:`TiledMap` to load the map from a ``.json`` file,
         created using :doc:`Tiled <tiled:manual/introduction>`. 
+        The background never changes, so it is drawn from a baked texture.
         """
         super().setup_maps()
         sprite_classes = {
             "Obstacles": Wall,
             "Background": Background,
         }
-        island_map = TiledMap(resolve_resource_path("images/island/island.json"), sprite_classes)
+        island_map = TiledMap(resolve_resource_path("images/island/island.json"), sprite_classes,
+                static_layers=["Background"])
         self.add_map(island_map)
 
     def setup_walls(self):
@@ -1,7 +1,7 @@
 from quest.game import QuestGame
 from quest.map import Map, GridMapLayer
 from quest.maze import Maze
-from quest.sprite import Wall, NPC
+from quest.sprite import Wall, NPC, CollisionCategory
 from quest.helpers import resolve_resource_path
 from itertools import product
 import arcade
@@ -99,6 +99,9 @@ class Loot(NPC):
     """Loot is a NPC which shows up in the game as a star. Its only job is to
     get collected by the player.
     """
+    collision_category = CollisionCategory.ITEM
+    collision_mask = CollisionCategory.PLAYER
+
     def on_collision(self, sprite, game):
         """When the player collides with a Loot, it calls :py:meth:`quest.maze.MazeMap.on_loot_collected` to tell
         the game to make needed updates. Then the Loot kills itself.
@@ -141,17 +144,17 @@ class MazeMap(Map):
         and loot sprites.
         
         Args:
-            seed: Random seed to pass to the maze (see :py:meth:`Maze.generate`)
+            seed: Random seed to pass to the maze (see :py:meth:`Maze.generate`). The loot
+                is placed using its own :py:class:`random.Random` with the same seed, so
+                the same seed always gives the same level.
         """
         self.maze.generate(seed)
         wall_map_layer = self.get_layer_by_name("walls")
         wall_map_layer.clear()
-        for x, y in self.maze.get_walls():
-            wall_map_layer.add_sprite(x, y)
+        wall_map_layer.add_sprites(self.maze.get_walls())
         loot_map_layer = self.get_layer_by_name("loot")
         loot_map_layer.clear()
-        for x, y in random.sample(self.possible_loot_locations(), self.num_loot):
-            loot_map_layer.add_sprite(x, y)
+        loot_map_layer.add_sprites(random.Random(seed).sample(self.possible_loot_locations(), self.num_loot))
 
     def get_wall_map_layer(self):
         """Creates a new :py:class:`GridMapLayer` to hold walls.
@@ -1,7 +1,11 @@
 import arcade
 from quest.engines import ContinuousPhysicsEngine
+from quest.clock import WallClock, TickClock
+from quest.lod import SimulationLOD
 from quest.errors import NoMapError, NoLayerError
+from quest.helpers import QuestSpriteList
 from quest.sprite import Player
+from quest.text_label import text_cache
 from time import time
 
 
@@ -39,6 +43,14 @@ class QuestGame(arcade.Window):
         player_initial_y: Initial y-coordinate for player center.
         view_bottom: y-coordinate of the bottom edge of the current viewport
         view_left: x-coordinate of the left edge of the current viewport
+        fixed_timestep: When True, the game advances in ticks of exactly
+            `1 / tick_rate` seconds, no matter how often :py:meth:`on_update`
+            is called. See :py:meth:`on_update`.
+        tick_rate: Ticks per second when `fixed_timestep` is True.
+        max_ticks_per_update: When `fixed_timestep` is True, the most ticks
+            which will be run in a single call to :py:meth:`on_update`.
+        lod_levels: When set, NPCs far from the viewport are updated less often.
+            A list of (distance, period) pairs; see :py:class:`SimulationLOD <quest.lod.SimulationLOD>`.
     """
     screen_width = 600
     screen_height = 600
@@ -55,12 +67,18 @@ class QuestGame(arcade.Window):
     view_bottom = 0
     view_left = 0
     game_over = False
+    fixed_timestep = False
+    tick_rate = 60
+    max_ticks_per_update = 5
+    lod_levels = None
 
     def __init__(self):
         """Initializes the game window and sets up other classes.
         """
-        super().__init__(self.screen_width, self.screen_height, self.screen_title)
+        self.setup_window()
         self.running = False
+        self.tick_accumulator = 0
+        self.setup_clock()
         self.setup_maps()
         if len(self.maps) > 0:
             self.set_current_map(0)
@@ -68,6 +86,7 @@ class QuestGame(arcade.Window):
         self.setup_walls()
         self.setup_npcs()
         self.setup_physics_engine()
+        self.setup_simulation_lod()
         self.center_view_on_player()
         self.current_modal = None
         # self.player_speed = None
@@ -82,6 +101,24 @@ class QuestGame(arcade.Window):
     def quit(self):
         arcade.close_window()
 
+    def setup_window(self):
+        """Opens the game window, using `screen_width`, `screen_height`, and `screen_title`.
+        """
+        super().__init__(self.screen_width, self.screen_height, self.screen_title)
+
+    def setup_clock(self):
+        """Sets up the game's clock, which tells the game what time it is.
+
+        When `fixed_timestep` is True, every tick lasts exactly `1 / tick_rate`
+        seconds of game time, so the game uses a :py:class:`TickClock <quest.clock.TickClock>`.
+        Otherwise it uses a :py:class:`WallClock <quest.clock.WallClock>`, which tells the
+        real time.
+        """
+        if self.fixed_timestep:
+            self.clock = TickClock(1 / self.tick_rate)
+        else:
+            self.clock = WallClock()
+
     def setup_maps(self):
         """Sets up the game maps.
 
@@ -98,25 +135,25 @@ class QuestGame(arcade.Window):
         """Creates the player sprite.
 
         Initializes a sprite for the player, assigns its starting position,
-        and appends the player sprite to an :py:class:`arcade:arcade.SpriteList` (Arcade likes to work
+        and appends the player sprite to a :py:class:`QuestSpriteList <quest.helpers.QuestSpriteList>` (Arcade likes to work
         with sprites in SpriteLists).
         """
         self.player = Player(self.player_sprite_image, self.player_scaling)
         self.player.center_x = self.player_initial_x
         self.player.center_y = self.player_initial_y
         self.player.speed = self.player_speed
-        self.player_list = arcade.SpriteList()
+        self.player_list = QuestSpriteList()
         self.player_list.append(self.player)
 
     def setup_walls(self):
         """Does any neccessary setup for NPCs.
         """
-        self.wall_list = arcade.SpriteList()
+        self.wall_list = QuestSpriteList()
 
     def setup_npcs(self):
         """Does any neccessary setup for NPCs.
         """
-        self.npc_list = arcade.SpriteList()
+        self.npc_list = QuestSpriteList()
 
     def add_map(self, game_map):
         """Adds a map to the list of maps.
@@ -170,23 +207,83 @@ class QuestGame(arcade.Window):
         """
         self.physics_engine = ContinuousPhysicsEngine(self)
 
+    def setup_simulation_lod(self):
+        """Sets up level of detail for NPC updates, if `lod_levels` is set.
+
+        Otherwise, `simulation_lod` is None and every NPC is updated every tick.
+        """
+        if self.lod_levels:
+            self.simulation_lod = SimulationLOD(self.lod_levels)
+        else:
+            self.simulation_lod = None
+
     def on_update(self, delta_time):
         """Updates the game's state.
 
-        At every tick, the game needs to be updated. The physics engine
-        updates sprite positions, and then sprite callbacks are executed.
-        Finally, the viewport is scrolled. Note that `on_update` changes the
-        state of the game, but does not draw anything to the screen.
+        Arcade calls `on_update` once per frame. By default, each call runs one
+        :py:meth:`tick`, so the game runs slower when the frame rate drops
+        (for example on a slow computer) and faster when it rises.
+
+        When `fixed_timestep` is True, the game instead keeps track of how much
+        time has passed (`tick_accumulator`) and runs one tick for every
+        `1 / tick_rate` seconds. If frames are slow, several ticks run before the
+        next frame is drawn, so the game keeps its speed. To avoid falling further
+        and further behind, at most `max_ticks_per_update` ticks run per frame; any
+        time beyond that is dropped.
 
         Args:
             delta_time: How much time has passed since the last update.
         """
-        if self.running:
-            self.player.on_update(self)
+        if not self.running:
+            return
+        if self.fixed_timestep:
+            tick_duration = 1 / self.tick_rate
+            self.tick_accumulator += delta_time
+            ticks = 0
+            while self.running and self.tick_accumulator >= tick_duration:
+                if ticks == self.max_ticks_per_update:
+                    self.tick_accumulator %= tick_duration
+                    break
+                self.tick()
+                self.tick_accumulator -= tick_duration
+                ticks += 1
+        else:
+            self.tick()
+
+    def tick(self):
+        """Advances the game by one tick.
+
+        At every tick, the game needs to be updated. Sprite callbacks are executed,
+        then the physics engine updates sprite positions. Finally, the viewport is
+        scrolled. Note that `tick` changes the state of the game, but does not draw
+        anything to the screen.
+        """
+        self.clock.tick()
+        self.update_player()
+        self.update_npcs()
+        self.physics_engine.update()
+        self.scroll_viewport()
+
+    def update_player(self):
+        """Calls the player's `on_update`.
+        """
+        self.player.on_update(self)
+
+    def update_npcs(self):
+        """Calls :py:meth:`update_npc` for each NPC.
+
+        When the game has a `simulation_lod`, it decides which NPCs to update.
+        """
+        if self.simulation_lod:
+            self.simulation_lod.update_npcs(self)
+        else:
             for npc in self.npc_list:
-                npc.on_update(self)
-            self.physics_engine.update()
-            self.scroll_viewport()
+                self.update_npc(npc)
+
+    def update_npc(self, npc):
+        """Calls the NPC's `on_update`.
+        """
+        npc.on_update(self)
 
     def on_draw(self):
         """Draws the screen.
@@ -199,17 +296,22 @@ class QuestGame(arcade.Window):
         arcade.start_render()
         arcade.set_background_color(self.get_current_map().background_color)
         for layer in self.get_current_map().layers:
-            layer.draw()
+            self.draw_layer(layer)
         self.npc_list.draw()
         self.player_list.draw()
         message = self.message()
         if message:
-            arcade.draw_text(message, 10 + self.view_left, 10 + self.view_bottom,
+            text_cache.draw(message, 10 + self.view_left, 10 + self.view_bottom,
                     arcade.csscolor.WHITE, 18)
         if self.current_modal:
             self.current_modal.on_draw()
 
 
+    def draw_layer(self, layer):
+        """Draws one layer of the current map.
+        """
+        layer.draw()
+
     def open_modal(self, modal):
         """Shows a modal window and pauses the game until the modal resolves.
         """
@@ -0,0 +1,105 @@
+from quest.clock import TickClock
+from time import time
+
+class HeadlessMixin:
+    """A mixin for QuestGame which runs the game without a window.
+
+    Opening a window (and the graphics context that comes with it) is slow, and is
+    pointless when nobody is watching: for example when testing a game automatically,
+    or when simulating thousands of games to check whether a level is balanced. A
+    headless game uses all the same setup methods (:py:meth:`setup_maps`,
+    :py:meth:`setup_player`, :py:meth:`setup_walls`, :py:meth:`setup_npcs`, and
+    :py:meth:`setup_physics_engine`) but never opens a window or draws anything.
+    Instead of waiting for Arcade to call :py:meth:`on_update`, :py:meth:`run` ticks
+    the game as fast as the computer can go. The game uses a
+    :py:class:`TickClock <quest.clock.TickClock>`, so each tick counts as `1 / tick_rate`
+    seconds of game time no matter how fast it actually runs, and results are the same
+    every time.
+
+    Mix this class into a game like this::
+
+        class HeadlessMazeGame(HeadlessMixin, MazeGame):
+            pass
+
+        game = HeadlessMazeGame()
+        game.run(1000)
+
+    or use :py:func:`headless` to do the same thing.
+
+    Attributes:
+        tick_count: The number of ticks run so far.
+    """
+    tick_count = 0
+
+    def setup_window(self):
+        """Does not open a window.
+        """
+
+    def setup_clock(self):
+        """Uses a :py:class:`TickClock <quest.clock.TickClock>`, since real time is meaningless here.
+        """
+        self.clock = TickClock(1 / self.tick_rate)
+
+    def update_viewport(self):
+        """Keeps track of `view_left` and `view_bottom`, but there is no viewport to update.
+        """
+
+    def run(self, ticks=1):
+        """Starts the game and runs it for a number of ticks.
+
+        Stops early if the game stops running (for example, if a modal opens or
+        :py:meth:`quit` is called).
+
+        Arguments:
+            ticks (int): The number of ticks to run.
+
+        Returns:
+            The number of ticks which were run.
+        """
+        self.start_time = time()
+        self.running = True
+        return self.step(ticks)
+
+    def step(self, ticks=1):
+        """Runs the game for a number of ticks, if it is running.
+
+        Arguments:
+            ticks (int): The number of ticks to run.
+
+        Returns:
+            The number of ticks which were run.
+        """
+        ticks_run = 0
+        while self.running and ticks_run < ticks:
+            self.tick()
+            self.tick_count += 1
+            ticks_run += 1
+        return ticks_run
+
+    def quit(self):
+        """Stops the game.
+        """
+        self.running = False
+
+    def on_draw(self):
+        """Does not draw anything.
+        """
+
+    def __repr__(self):
+        return "<{}>".format(self.__class__.__name__)
+
+def headless(game_class):
+    """Creates a headless version of a game class.
+
+        >>> from quest.examples.maze import MazeGame
+        >>> game = headless(MazeGame)()
+        >>> game.run(600)
+        600
+
+    Arguments:
+        game_class: A subclass of :py:class:`QuestGame <quest.game.QuestGame>`.
+
+    Returns:
+        A subclass of `game_class` with :py:class:`HeadlessMixin` mixed in.
+    """
+    return type("Headless" + game_class.__name__, (HeadlessMixin, game_class), {})
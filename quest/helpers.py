@@ -1,10 +1,12 @@
 from PIL import Image
+import arcade
 import xml.etree.ElementTree as ET
 import quest
 from itertools import product, chain
 from pathlib import Path
 from enum import Flag, auto
 from math import sqrt
+import json
 import re
 
 def tint(color, ratio=0.25):
@@ -132,23 +134,146 @@ class Direction(Flag):
             vx, vy = normalize((vx, vy))
         return vx, vy
 
+class QuestSpriteList(arcade.SpriteList):
+    """An :py:class:`arcade.SpriteList` which counts how many times it has changed.
+
+    Every time a sprite is added, removed, or moved to a different place in the list,
+    `version` goes up by one. Code which keeps a copy of the list's sprites (like
+    :py:class:`SpriteListList`) can check `version` to find out whether its copy is
+    out of date, instead of copying the sprites again every time.
+
+    `sprite_version` works the same way, but goes up when one of the sprites in the list
+    moves, changes size, or changes how it looks (its texture, color, or angle). Code which
+    depends on where the sprites are or what they look like (like the chunks and baked
+    chunks of a :py:class:`MapLayer <quest.map.MapLayer>`) can check both.
+    """
+    def __init__(self, *args, **kwargs):
+        self.version = 0
+        self.sprite_version = 0
+        super().__init__(*args, **kwargs)
+
+    def append(self, sprite):
+        self.version += 1
+        super().append(sprite)
+
+    def insert(self, index, sprite):
+        self.version += 1
+        super().insert(index, sprite)
+
+    def remove(self, sprite):
+        self.version += 1
+        super().remove(sprite)
+        if self._deferred_sprites:
+            # Without a window, Arcade keeps every sprite added to the list in a set, to
+            # set them up once there is one. Removed sprites are never taken out of the
+            # set, so a headless game which adds and removes sprites would keep them all.
+            self._deferred_sprites.discard(sprite)
+
+    def clear(self, *args, **kwargs):
+        self.version += 1
+        super().clear(*args, **kwargs)
+
+    def __setitem__(self, index, sprite):
+        self.version += 1
+        return super().__setitem__(index, sprite)
+
+    def swap(self, index_1, index_2):
+        self.version += 1
+        super().swap(index_1, index_2)
+
+    def reverse(self):
+        self.version += 1
+        super().reverse()
+
+    def shuffle(self):
+        self.version += 1
+        super().shuffle()
+
+    def sort(self, *args, **kwargs):
+        self.version += 1
+        super().sort(*args, **kwargs)
+
+    def update_position(self, sprite):
+        self.sprite_version += 1
+        super().update_position(sprite)
+
+    def update_location(self, sprite):
+        self.sprite_version += 1
+        super().update_location(sprite)
+
+    def update_size(self, sprite):
+        self.sprite_version += 1
+        super().update_size(sprite)
+
+    def update_width(self, sprite):
+        self.sprite_version += 1
+        super().update_width(sprite)
+
+    def update_height(self, sprite):
+        self.sprite_version += 1
+        super().update_height(sprite)
+
+    def update_angle(self, sprite):
+        self.sprite_version += 1
+        super().update_angle(sprite)
+
+    def update_texture(self, sprite):
+        self.sprite_version += 1
+        super().update_texture(sprite)
+
+    def update_color(self, sprite):
+        self.sprite_version += 1
+        super().update_color(sprite)
+
 class SpriteListList:
     """Allows multiple SpriteLists to be treated as if they were a single SpriteList.
+
+    Iterating over a SpriteListList goes through a flat list of all the sprites,
+    which is built the first time it is needed and then reused. When all the sprite
+    lists are :py:class:`QuestSpriteList` objects, the flat list is only rebuilt after
+    one of them changes (this is checked using their `version`). Other sprite lists
+    can't tell when they change, so the flat list is rebuilt every time.
     """
     def __init__(self, sprite_lists):
         self.sprite_lists = sprite_lists
+        self.cached_version = None
+        self.cached_sprites = []
 
     def chain_sprite_lists(self):
         return chain.from_iterable(self.sprite_lists)
 
+    def version(self):
+        """Returns a tuple of the sprite lists' versions, or None if any of the sprite lists
+        doesn't have a version.
+        """
+        versions = tuple(getattr(sprite_list, "version", None) for sprite_list in self.sprite_lists)
+        if None in versions:
+            return None
+        return versions
+
+    def sprites(self):
+        """Returns a list of all the sprites in all the sprite lists.
+
+        The list is shared, so it should not be changed. When a sprite list changes,
+        a new list is returned the next time this is called.
+        """
+        version = self.version()
+        if version is None or version != self.cached_version:
+            self.cached_sprites = list(self.chain_sprite_lists())
+            self.cached_version = version
+        return self.cached_sprites
+
     def __iter__(self):
-        return iter(self.chain_sprite_lists())
+        return iter(self.sprites())
+
+    def __len__(self):
+        return len(self.sprites())
 
     def update(self):
-        for sprite_list in self.chain_sprite_lists():
-            sprite_list.update()
+        for sprite in self.sprites():
+            sprite.update()
 
-def tileset_to_collection(image_path, tile_size, output_dir, name="tileset", create_tsx=True):
+def tileset_to_collection(image_path, tile_size, output_dir, name="tileset", create_tsx=True, create_atlas=False):
     """Splits a tileset image into separate files.
 
     Quest relies on Arcade, which only works with collections of images. 
@@ -163,11 +288,15 @@ def tileset_to_collection(image_path, tile_size, output_dir, name="tileset", cre
         create_tsx: If True, also creates a tsx file which can be opened as a
             :doc:`Tileset <tiled:manual/editing-tilesets>` using 
             :doc:`Tiled <tiled:manual/introduction>`.
+        create_atlas: If True, also saves a copy of the tileset image as `{name}_atlas.png`,
+            with a `{name}_atlas.json` index saying where each tile file is in it. See
+            :py:class:`TileAtlas`.
 
     """
     img = Image.open(image_path)
     width, height = img.size
     cols, rows = width // tile_size, height // tile_size
+    regions = {}
     for i, j in product(range(cols), range(rows)):
         left = i * tile_size
         upper = j * tile_size
@@ -176,6 +305,12 @@ def tileset_to_collection(image_path, tile_size, output_dir, name="tileset", cre
         tile = img.crop((left, upper, right, lower))
         output_path = Path(output_dir) / "img_{}_{}.png".format(j, i)
         tile.save(output_path)
+        regions[output_path.name] = (left, upper, tile_size, tile_size)
+
+    if create_atlas:
+        atlas_path = Path(output_dir) / "{}_atlas.png".format(name)
+        img.save(atlas_path)
+        TileAtlas(atlas_path, regions).save(atlas_path.with_suffix(".json"))
 
     if create_tsx:
         tileset = empty_tileset(tile_size, cols, rows, name)
@@ -207,6 +342,101 @@ def add_tile(tileset, tile_id, img_path, tile_size):
     img_element.set('height', str(tile_size))
     img_element.set('source', img_path)
 
+class TileAtlas:
+    """A single image containing many tile images, with an index of where each tile is.
+
+    Tiled maps often use a collection of separate tile images (see
+    :py:func:`tileset_to_collection`). Loading a map then means opening and decoding
+    each image file separately. A TileAtlas packs the tiles into one image, so it only
+    needs to be opened once; each tile's texture is cut out of the atlas. Pass the atlas
+    to :py:class:`TiledMap <quest.map.TiledMap>` using its `atlas` argument.
+
+    An atlas is saved as a JSON index next to its image. Use :py:func:`pack_atlas` to create
+    an atlas from separate images, or :py:func:`tileset_to_collection` (with `create_atlas=True`)
+    to use the original tileset image as the atlas.
+
+    Arguments:
+        image_path: Path to the atlas image.
+        regions: A dict mapping tile filenames (relative to the atlas's directory) to
+            (x, y, width, height) regions of the atlas image, measured from the top left.
+    """
+    def __init__(self, image_path, regions):
+        self.image_path = Path(image_path)
+        self.regions = regions
+
+    @classmethod
+    def load(cls, index_path):
+        """Loads an atlas from its JSON index.
+        """
+        index_path = Path(index_path)
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        regions = {filename: tuple(region) for filename, region in index["regions"].items()}
+        return cls(index_path.parent / index["image"], regions)
+
+    def save(self, index_path):
+        """Saves the atlas's JSON index. The atlas image should be in the same directory.
+        """
+        index = {
+            "image": self.image_path.name,
+            "regions": {filename: list(region) for filename, region in self.regions.items()},
+        }
+        with open(index_path, "w") as index_file:
+            json.dump(index, index_file, indent=1)
+
+    def get_region(self, image_path):
+        """Returns the (x, y, width, height) region of the atlas containing an image, or None
+        if the image is not in the atlas.
+        """
+        try:
+            filename = Path(image_path).resolve().relative_to(self.image_path.parent.resolve())
+        except ValueError:
+            return None
+        return self.regions.get(filename.as_posix())
+
+def pack_atlas(image_paths, atlas_path, padding=1):
+    """Packs separate images into a single atlas image, and saves it with its JSON index.
+
+    Images are sorted from tallest to shortest and placed left to right in rows ("shelves"),
+    starting a new shelf whenever a row is full. This doesn't pack as tightly as possible,
+    but tiles are usually all the same size, and then it is perfect.
+
+    Arguments:
+        image_paths: Paths to the images to pack. They should be in the same directory as
+            `atlas_path` (or in directories inside it).
+        atlas_path: Path for the atlas image (a `.png` file). The index is saved next to it,
+            with a `.json` suffix.
+        padding: Empty pixels between images.
+
+    Returns:
+        A :py:class:`TileAtlas`.
+    """
+    atlas_path = Path(atlas_path)
+    images = [(Path(path), Image.open(path)) for path in image_paths]
+    images.sort(key=lambda item: item[1].size[1], reverse=True)
+    total_area = sum((image.size[0] + padding) * (image.size[1] + padding) for path, image in images)
+    max_width = max([image.size[0] for path, image in images] + [1])
+    atlas_width = max(max_width, int(sqrt(total_area)) + 1)
+    regions = {}
+    x, y, shelf_height = 0, 0, 0
+    for path, image in images:
+        width, height = image.size
+        if x + width > atlas_width:
+            x, y, shelf_height = 0, y + shelf_height + padding, 0
+        filename = path.resolve().relative_to(atlas_path.parent.resolve()).as_posix()
+        regions[filename] = (x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    atlas = Image.new("RGBA", (atlas_width, max(y + shelf_height, 1)))
+    for path, image in images:
+        filename = path.resolve().relative_to(atlas_path.parent.resolve()).as_posix()
+        x, y, width, height = regions[filename]
+        atlas.paste(image.convert("RGBA"), (x, y))
+    atlas.save(atlas_path)
+    tile_atlas = TileAtlas(atlas_path, regions)
+    tile_atlas.save(atlas_path.with_suffix(".json"))
+    return tile_atlas
+
 def normalize(vector):
     return scale(vector, 1)
 
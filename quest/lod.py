@@ -0,0 +1,102 @@
+from math import hypot
+
+class SimulationLOD:
+    """Updates NPCs less often the farther they are from the viewport.
+
+    On a large map, most NPCs are far away from the part of the map the player can see.
+    Nobody will notice if they are updated less carefully. This idea is called "level of
+    detail" (LOD). NPCs near the viewport are updated every tick, as usual. NPCs farther
+    away are only updated every few ticks, and on those ticks they move several ticks'
+    worth of distance, so they still travel at the same average speed. NPCs beyond the
+    farthest level are frozen: they don't update or move at all until the viewport comes
+    closer.
+
+    For example, with `levels=[(200, 1), (1000, 4)]`, NPCs within 200 pixels of the
+    viewport update every tick, NPCs within 1000 pixels update every fourth tick, and
+    NPCs farther away are frozen. Far NPCs take turns, so that they don't all update on
+    the same tick.
+
+    While an NPC is waiting for its turn (or frozen), its velocity is saved and set to
+    zero, so the physics engine doesn't move it. Because far NPCs move several ticks of
+    distance at once, fast far NPCs could jump through thin walls; the physics engine's
+    `swept_collisions` option prevents this.
+
+    Arguments:
+        levels: A list of (distance, period) pairs. NPCs within `distance` pixels of the
+            viewport are updated every `period` ticks.
+    """
+    def __init__(self, levels):
+        self.levels = sorted(levels)
+        self.ticks = 0
+        self.next_phase = 0
+
+    def distance_to_viewport(self, sprite, game):
+        """Returns the distance (in pixels) from the sprite's center to the viewport,
+        or 0 if the sprite is inside the viewport.
+        """
+        dx = max(game.view_left - sprite.center_x, 0,
+                sprite.center_x - (game.view_left + game.screen_width))
+        dy = max(game.view_bottom - sprite.center_y, 0,
+                sprite.center_y - (game.view_bottom + game.screen_height))
+        return hypot(dx, dy)
+
+    def get_period(self, sprite, game):
+        """Returns how many ticks there should be between the sprite's updates,
+        or None if the sprite should be frozen.
+        """
+        distance = self.distance_to_viewport(sprite, game)
+        for max_distance, period in self.levels:
+            if distance <= max_distance:
+                return period
+        return None
+
+    def get_phase(self, sprite):
+        """Returns a number used to spread out far sprites' updates across ticks.
+        """
+        if not hasattr(sprite, "lod_phase"):
+            sprite.lod_phase = self.next_phase
+            self.next_phase += 1
+        return sprite.lod_phase
+
+    def update_npcs(self, game):
+        """Calls :py:meth:`QuestGame.update_npc <quest.game.QuestGame.update_npc>` for each
+        NPC which is due for an update this tick.
+        """
+        for npc in game.npc_list:
+            period = self.get_period(npc, game)
+            if period is None:
+                self.hold(npc)
+            elif period == 1:
+                self.release(npc)
+                game.update_npc(npc)
+            elif (self.ticks + self.get_phase(npc)) % period == 0:
+                self.release(npc)
+                game.update_npc(npc)
+                npc.lod_scale = period
+                npc.change_x *= period
+                npc.change_y *= period
+            else:
+                self.hold(npc)
+        self.ticks += 1
+
+    def hold(self, sprite):
+        """Saves the sprite's velocity (per tick) and stops it.
+        """
+        if getattr(sprite, "lod_velocity", None) is None:
+            scale = getattr(sprite, "lod_scale", 1)
+            sprite.lod_velocity = (sprite.change_x / scale, sprite.change_y / scale)
+            sprite.lod_scale = 1
+            sprite.change_x = 0
+            sprite.change_y = 0
+
+    def release(self, sprite):
+        """Gives the sprite back its saved velocity, if it has one.
+        """
+        if getattr(sprite, "lod_velocity", None) is not None:
+            sprite.change_x, sprite.change_y = sprite.lod_velocity
+            sprite.lod_velocity = None
+        else:
+            scale = getattr(sprite, "lod_scale", 1)
+            sprite.change_x /= scale
+            sprite.change_y /= scale
+        sprite.lod_scale = 1
@@ -1,8 +1,13 @@
 import arcade
 from quest.errors import NoLayerError, MultipleLayersError
 from quest.sprite import QuestSprite
+from quest.helpers import TileAtlas, QuestSpriteList
+from quest.rendering import BakedSpriteList
+from quest.map_cache import CompiledMap, map_cache_path
+from collections import defaultdict
 from math import floor
 from pathlib import Path
+import numpy as np
 
 RED = 0
 GREEN = 0
@@ -28,6 +33,7 @@ class Map:
         """Initialize a Map with an empty layers list.
         """
         self.layers = []
+        self.layer_index = {}
 
     def add_layer(self, layer):
         """Add a layer the the layers list.
@@ -37,22 +43,25 @@ class Map:
         Args:
             layer: The MapLayer to add.
         """
-        for existing_layer in self.layers:
-            if existing_layer.name == layer.name:
-                raise ValueError("Map already has a layer named {}".format(layer.name))
+        if layer.name in self.layer_index:
+            raise ValueError("Map already has a layer named {}".format(layer.name))
         self.layers.append(layer)
+        self.layer_index[layer.name] = layer
 
     def get_layer_by_name(self, layer_name):
         """Looks up a map layer by name. 
 
         There should only be one layer with each name. If there is not exactly one layer,
-        raises an error. 
+        raises an error. Layers added with :py:meth:`add_layer` are found in `layer_index`
+        without searching through all the layers.
 
         Args:
             layer_name: The name of the layer.
 
         Returns: The layer.
         """
+        if layer_name in self.layer_index:
+            return self.layer_index[layer_name]
         layers = [layer for layer in self.layers if layer.name == layer_name]
         if len(layers) == 0:
             raise NoLayerError("Map has no layer named {} (layers are: {})".format(layer_name, 
@@ -77,52 +86,230 @@ class TiledMap(Map):
             layers in the tilemap and whose values should be sprite classes (subclasses of
             :py:class:`QuestSprite`. For each layer, 
             each sprite will be initialized using the given sprite class. 
+        chunk_size (int): Optional size (in pixels) of chunks for drawing each layer.
+            See :py:class:`MapLayer`.
+        static_layers: Optional list of names of layers which never change, and can be
+            drawn from baked textures. See :py:class:`MapLayer`.
+        cache: Whether to use a compiled copy of the map, saved the first time the map
+            is loaded (see :py:class:`CompiledMap <quest.map_cache.CompiledMap>`). Loading
+            the compiled copy is much faster. When True, it is saved in the user's cache
+            directory (see :py:func:`user_cache_dir <quest.map_cache.user_cache_dir>`);
+            `cache` can also be the path of a directory to save it in. The compiled copy
+            is only used if the map file and `sprite_classes` haven't changed. Default False.
+        atlas: Optional :py:class:`TileAtlas <quest.helpers.TileAtlas>` (or path to an atlas's
+            JSON index) containing the map's tile images. Tiles found in the atlas use textures
+            cut out of the atlas image, so only one image file needs to be loaded.
     """
-    def __init__(self, filename, sprite_classes):
+    def __init__(self, filename, sprite_classes, chunk_size=None, static_layers=(), cache=False, atlas=None):
         filepath = Path(filename)
         if not filepath.exists():
             raise ValueError(f"File {filepath} not found.")
         if not filepath.suffix == ".json":
             raise ValueError(f"Tilemaps must be in JSON format.")
         super().__init__()
-        tilemap = arcade.load_tilemap(filepath)
-        for layer_name, layer_sprite_list in tilemap.sprite_lists.items():
-            if not layer_name in sprite_classes:
-                raise ValueError(f"Layer {layer_name} is not specified in sprite_classes {sprite_classes}.")
+        for layer_name, tiles in self.load_tiles(filepath, sprite_classes, cache, atlas):
             sprite_class = sprite_classes[layer_name]
-            quest_sprite_list = arcade.SpriteList()
-            for sprite in layer_sprite_list:
+            quest_sprite_list = QuestSpriteList()
+            for x, y, texture in tiles:
                 quest_sprite = sprite_class()
-                quest_sprite.center_x = sprite.center_x
-                quest_sprite.center_y = sprite.center_y
-                quest_sprite.texture = sprite.texture
+                quest_sprite.center_x = x
+                quest_sprite.center_y = y
+                quest_sprite.texture = texture
                 
                 quest_sprite_list.append(quest_sprite)
-            layer = MapLayer(layer_name, quest_sprite_list)
+            layer = MapLayer(layer_name, quest_sprite_list, chunk_size=chunk_size,
+                    static=layer_name in static_layers)
             self.add_layer(layer)
 
+    def load_tiles(self, filepath, sprite_classes, cache=False, atlas=None):
+        """Returns a list of (layer_name, tiles) for each layer in the map, where tiles is a
+        list of (x, y, texture).
+
+        When `cache` is set and a compiled copy of the map exists, the tiles are read from it.
+        Otherwise, the map is loaded using :py:func:`arcade.load_tilemap`, and (when `cache`
+        is set) a compiled copy is saved for next time. If the compiled copy can't be read
+        or written, the map is loaded as usual. When there is an `atlas`, textures are cut
+        out of the atlas image.
+        """
+        if cache:
+            cache_dir = None if cache is True else cache
+            cache_path = map_cache_path(filepath, sprite_classes, cache_dir)
+        else:
+            cache_path = None
+        compiled = None
+        if cache_path and cache_path.exists():
+            try:
+                compiled = CompiledMap.load(cache_path)
+            except (OSError, ValueError, KeyError):
+                pass
+        if compiled is None:
+            tilemap = arcade.load_tilemap(filepath)
+            for layer_name in tilemap.sprite_lists:
+                if not layer_name in sprite_classes:
+                    raise ValueError(f"Layer {layer_name} is not specified in sprite_classes {sprite_classes}.")
+            if cache_path or atlas:
+                compiled = CompiledMap.from_sprite_lists(tilemap.sprite_lists, filepath.parent)
+            if compiled and cache_path:
+                try:
+                    compiled.save(cache_path)
+                except OSError:
+                    pass
+            if compiled is None:
+                return [
+                    (layer_name, [(sprite.center_x, sprite.center_y, sprite.texture) for sprite in sprite_list])
+                    for layer_name, sprite_list in tilemap.sprite_lists.items()
+                ]
+        if atlas:
+            if not isinstance(atlas, TileAtlas):
+                atlas = TileAtlas.load(atlas)
+            compiled = compiled.use_atlas(atlas, filepath.parent)
+        textures = compiled.load_textures(filepath.parent)
+        return [
+            (layer_name, [(x, y, textures[i]) for (x, y), i in zip(positions.tolist(), ids.tolist())])
+            for layer_name, positions, ids in compiled.layers
+        ]
+
 class MapLayer:
     """
     Each Map is made up of one or more MapLayers. 
 
+    A big map might have a layer with thousands of sprites, but only a few of them are
+    on the screen at once. When `chunk_size` is set, the layer splits its sprites into
+    square chunks, each `chunk_size` pixels wide, and only draws the chunks which
+    overlap the viewport. The chunks are worked out the first time the layer is drawn,
+    and again whenever the layer's sprites change. When `sprite_list` is a
+    :py:class:`QuestSpriteList <quest.helpers.QuestSpriteList>` (the default), this
+    includes sprites being moved or resized; other sprite lists can only tell when their
+    length changes, so after changing their sprites you need to call
+    :py:meth:`invalidate_chunks`. Chunks are meant for layers whose sprites stay where
+    they are (like the background or walls), because they are rebuilt every time a
+    sprite moves.
+
+    Layers which never change at all (like a background) can be `static`. Then each chunk
+    is drawn once into a texture (see :py:class:`BakedSpriteList <quest.rendering.BakedSpriteList>`),
+    and after that drawing the chunk just means drawing its texture. Baked chunks are
+    thrown away whenever the chunks are rebuilt, which (for a `QuestSpriteList`) also
+    happens when a sprite's texture, color, or angle changes. Static layers use
+    chunks of `static_chunk_size` pixels unless `chunk_size` is given. Where sprites from
+    different chunks overlap, they may be drawn in a different order than in `sprite_list`.
+
     Arguments:
         name (str): The layer name. 
         sprite_list: An optional :py:class:`arcade.SpriteList`.
+        chunk_size (int): Optional size (in pixels) of chunks.
+        static (bool): Whether to draw the layer from baked textures. Default False.
     """
-    def __init__(self, name, sprite_list=None):
+    static_chunk_size = 1024
+
+    def __init__(self, name, sprite_list=None, chunk_size=None, static=False):
         self.name = name
-        self.sprite_list = sprite_list or arcade.SpriteList()
+        self.sprite_list = sprite_list or QuestSpriteList()
+        self.static = static
+        self.chunk_size = chunk_size or (self.static_chunk_size if static else None)
+        self.chunks = None
+        self.baked_chunks = {}
 
     def draw(self):
-        """Renders the layer by calling 
+        """Renders the layer by drawing its sprite list, or just the chunks that are
+        in the viewport.
+        """
+        if self.static:
+            for chunk in self.get_visible_chunk_keys(arcade.get_viewport()):
+                self.get_baked_chunk(chunk).draw()
+        elif self.chunk_size:
+            for chunk in self.get_visible_chunks(arcade.get_viewport()):
+                chunk.draw()
+        else:
+            self.sprite_list.draw()
+
+    def build_chunks(self):
+        """Sorts the layer's sprites into chunks, based on the positions of their centers.
+
+        Sprites can stick out of their chunk by up to half their size, so
+        `chunk_margin` keeps track of how far chunks might reach beyond their edges.
+        Any baked chunks are thrown away.
+        """
+        self.invalidate_chunks()
+        self.chunks = defaultdict(arcade.SpriteList)
+        self.chunk_margin = 0
+        for sprite in self.sprite_list:
+            chunk = (floor(sprite.center_x / self.chunk_size), floor(sprite.center_y / self.chunk_size))
+            self.chunks[chunk].append(sprite)
+            self.chunk_margin = max(self.chunk_margin, sprite.width / 2, sprite.height / 2)
+        self.chunk_key = self.get_chunk_key()
+        self.baked_chunks = {}
+
+    def invalidate_chunks(self):
+        """Tells the layer to rebuild its chunks (and baked chunks) before it is drawn next.
+
+        The old chunks are emptied right away. Every sprite keeps a list of the sprite lists
+        it belongs to, so otherwise the sprites would hold on to every chunk they were ever in.
+        """
+        if self.chunks is not None:
+            for chunk in self.chunks.values():
+                chunk.clear()
+        self.chunks = None
+
+    def get_chunk_key(self):
+        """Returns a value which changes whenever the chunks need to be rebuilt.
+        """
+        return (
+            len(self.sprite_list),
+            getattr(self.sprite_list, "version", None),
+            getattr(self.sprite_list, "sprite_version", None),
+        )
+
+    def get_visible_chunk_keys(self, viewport):
+        """Returns a list of the (x, y) keys of chunks which overlap the viewport.
+
+        Arguments:
+            viewport: (left, right, bottom, top), as returned by :py:func:`arcade.get_viewport`.
+        """
+        if self.chunks is None or self.get_chunk_key() != self.chunk_key:
+            self.build_chunks()
+        left, right, bottom, top = viewport
+        first_x = floor((left - self.chunk_margin) / self.chunk_size)
+        last_x = floor((right + self.chunk_margin) / self.chunk_size)
+        first_y = floor((bottom - self.chunk_margin) / self.chunk_size)
+        last_y = floor((top + self.chunk_margin) / self.chunk_size)
+        visible = []
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                if self.chunks.get((chunk_x, chunk_y)):
+                    visible.append((chunk_x, chunk_y))
+        return visible
+
+    def get_visible_chunks(self, viewport):
+        """Returns a list of the chunks (sprite lists) which overlap the viewport.
+
+        Arguments:
+            viewport: (left, right, bottom, top), as returned by :py:func:`arcade.get_viewport`.
         """
-        self.sprite_list.draw()
+        return [self.chunks[chunk] for chunk in self.get_visible_chunk_keys(viewport)]
+
+    def get_baked_chunk(self, chunk):
+        """Returns a :py:class:`BakedSpriteList <quest.rendering.BakedSpriteList>` for a chunk,
+        baking it if needed.
+        """
+        if chunk not in self.baked_chunks:
+            chunk_x, chunk_y = chunk
+            bounds = (
+                chunk_x * self.chunk_size - self.chunk_margin,
+                chunk_y * self.chunk_size - self.chunk_margin,
+                (chunk_x + 1) * self.chunk_size + self.chunk_margin,
+                (chunk_y + 1) * self.chunk_size + self.chunk_margin,
+            )
+            self.baked_chunks[chunk] = BakedSpriteList(self.chunks[chunk], bounds)
+        return self.baked_chunks[chunk]
 
     def clear(self):
         """Delete all this layer's sprites.
+
+        The sprites are removed all at once, rather than one at a time (removing sprites
+        one at a time from a large sprite list is slow).
         """
-        while len(self.sprite_list) > 0:
-            self.sprite_list.pop()
+        self.sprite_list.clear()
+        self.invalidate_chunks()
 
 class GridMapLayer(MapLayer):
     """
@@ -141,13 +328,15 @@ class GridMapLayer(MapLayer):
         sprite_filename (str): Path to sprite image file. Only needed if you will be creating sprites
             on this grid layer.
         sprite_class: Class of sprites to create on this layer.
+        chunk_size (int): Optional size (in pixels) of chunks for drawing. See :py:class:`MapLayer`.
 
     """
 
     sprite_class = QuestSprite
 
-    def __init__(self, name, columns, rows, pixel_width, pixel_height, sprite_filename=None, sprite_class=None):
-        super().__init__(name)
+    def __init__(self, name, columns, rows, pixel_width, pixel_height, sprite_filename=None, sprite_class=None,
+            chunk_size=None):
+        super().__init__(name, chunk_size=chunk_size)
         self.columns = columns
         self.rows = rows
         self.pixel_width = pixel_width
@@ -169,6 +358,32 @@ class GridMapLayer(MapLayer):
         sprite.left, sprite.bottom = self.get_pixel_position((grid_x, grid_y))
         self.sprite_list.append(sprite)
 
+    def add_sprites(self, grid_positions):
+        """Creates new sprites at many grid positions at once, and returns them.
+
+        This does the same thing as calling :py:meth:`add_sprite` for each grid position,
+        but much faster: all the sprites share one texture (see :py:meth:`get_texture`),
+        all their pixel positions are worked out at once using NumPy, and they are added to
+        the sprite list together.
+
+        Arguments:
+            grid_positions: A list (or NumPy array) of (grid_x, grid_y) positions.
+        """
+        texture = self.get_texture()
+        sprites = [self.sprite_class() for i in range(len(grid_positions))]
+        if not sprites:
+            return sprites
+        for sprite in sprites:
+            sprite.texture = texture
+        # Every sprite has the same texture, so every sprite's left and bottom edges are the
+        # same distance from its center.
+        edge_offset = np.array([sprites[0].center_x - sprites[0].left, sprites[0].center_y - sprites[0].bottom])
+        centers = self.get_pixel_positions(grid_positions) + edge_offset
+        for sprite, (x, y) in zip(sprites, centers.tolist()):
+            sprite.position = x, y
+        self.sprite_list.extend(sprites)
+        return sprites
+
     def create_sprite(self):
         """Creates a sprite with image `self.sprite_filename` and class `self.sprite_class`. 
         """
@@ -176,6 +391,17 @@ class GridMapLayer(MapLayer):
             raise ValueError("Can't add sprites to GridMapLayer unless sprite_filename is defined.")
         return self.sprite_class(self.sprite_filename)
 
+    def get_texture(self):
+        """Returns the texture for image `self.sprite_filename`, which is loaded the first time
+        it is needed and then shared by all the sprites created by :py:meth:`add_sprites`.
+        """
+        if self.sprite_filename is None:
+            raise ValueError("Can't add sprites to GridMapLayer unless sprite_filename is defined.")
+        if getattr(self, "texture", None) is None or self.texture_filename != self.sprite_filename:
+            self.texture = arcade.load_texture(self.sprite_filename)
+            self.texture_filename = self.sprite_filename
+        return self.texture
+
     def get_pixel_position(self, grid_position, center=True):
         """Converts pixel coordinates to grid coordinates.
 
@@ -196,6 +422,25 @@ class GridMapLayer(MapLayer):
             pixel_y += (self.pixel_height / self.rows) / 2
         return pixel_x, pixel_y
 
+    def get_pixel_positions(self, grid_positions, center=True):
+        """Converts many grid positions to pixel positions at once, like :py:meth:`get_pixel_position`.
+
+        Arguments:
+            grid_positions: A list (or NumPy array) of (grid_x, grid_y) positions.
+            center (bool): Whether to return the centers of the grid tiles (the default)
+                or their lower left corners.
+
+        Returns:
+            An (n, 2) NumPy array of pixel positions.
+        """
+        grid_positions = np.asarray(grid_positions, dtype=float).reshape(-1, 2)
+        tile_size = np.array([self.pixel_width / self.columns, self.pixel_height / self.rows])
+        pixel_positions = np.array([self.pixel_width, self.pixel_height]) * (
+                grid_positions / np.array([self.columns, self.rows]))
+        if center:
+            pixel_positions += tile_size / 2
+        return pixel_positions
+
     def get_grid_position(self, pixel_position):
         """Converts grid position to pixel position. 
 
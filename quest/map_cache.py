@@ -0,0 +1,202 @@
+import arcade
+from hashlib import sha256
+from pathlib import Path
+import json
+import numpy as np
+import os
+import sys
+
+CACHE_VERSION = 1
+
+class CompiledMap:
+    """The information needed to rebuild the sprites of a :py:class:`TiledMap <quest.map.TiledMap>`.
+
+    Loading a Tiled map means reading the JSON file, working out which image goes with
+    each tile, and creating a sprite for every tile. CompiledMap stores just the results:
+    each layer's tile positions and which texture each tile uses. These are kept in NumPy
+    arrays and saved as a `.npz` file, so they can be loaded again very quickly.
+
+    Textures are described by the arguments needed to load them with
+    :py:func:`arcade.load_texture`: (filename, x, y, width, height, flipped_horizontally,
+    flipped_vertically, flipped_diagonally, hit_box_algorithm). Filenames are stored
+    relative to the map's directory.
+
+    Arguments:
+        layers: A list of (layer_name, positions, texture_ids), where positions is an
+            (n, 2) array of tile centers and texture_ids is an array of indices into `textures`.
+        textures: A list of texture descriptions.
+    """
+    def __init__(self, layers, textures):
+        self.layers = layers
+        self.textures = textures
+
+    @classmethod
+    def from_sprite_lists(cls, sprite_lists, map_directory):
+        """Compiles a dict of {layer_name: sprite_list}, as loaded by :py:func:`arcade.load_tilemap`.
+
+        Returns None if a texture can't be described (for example, an animated tile).
+        """
+        texture_ids = {}
+        textures = []
+        layers = []
+        for layer_name, sprite_list in sprite_lists.items():
+            positions = np.array([sprite.position for sprite in sprite_list], dtype=float).reshape(-1, 2)
+            ids = []
+            for sprite in sprite_list:
+                name = sprite.texture.name
+                if name not in texture_ids:
+                    texture = describe_texture(name, map_directory)
+                    if texture is None:
+                        return None
+                    texture_ids[name] = len(textures)
+                    textures.append(texture)
+                ids.append(texture_ids[name])
+            layers.append((layer_name, positions, np.array(ids, dtype=np.int32)))
+        return cls(layers, textures)
+
+    def load_textures(self, map_directory):
+        """Returns a list of :py:class:`arcade.Texture` objects, one for each texture description.
+        """
+        textures = []
+        for filename, x, y, width, height, flip_h, flip_v, flip_d, hit_box_algorithm in self.textures:
+            textures.append(arcade.load_texture(
+                str(Path(map_directory) / filename), x, y, width, height,
+                flipped_horizontally=flip_h,
+                flipped_vertically=flip_v,
+                flipped_diagonally=flip_d,
+                hit_box_algorithm=hit_box_algorithm,
+            ))
+        return textures
+
+    def use_atlas(self, atlas, map_directory):
+        """Returns a copy of the compiled map whose textures are cut out of a
+        :py:class:`TileAtlas <quest.helpers.TileAtlas>` wherever possible.
+        """
+        atlas_filename = os.path.relpath(atlas.image_path, map_directory)
+        textures = []
+        for texture in self.textures:
+            filename, x, y, width, height, flip_h, flip_v, flip_d, hit_box_algorithm = texture
+            region = atlas.get_region(Path(map_directory) / filename)
+            if region:
+                region_x, region_y, region_width, region_height = region
+                texture = (atlas_filename, region_x + x, region_y + y, width or region_width,
+                        height or region_height, flip_h, flip_v, flip_d, hit_box_algorithm)
+            textures.append(texture)
+        return CompiledMap(self.layers, textures)
+
+    def save(self, path):
+        """Saves the compiled map as a `.npz` file.
+        """
+        files, numbers, flips, hit_box_algorithms = [], [], [], []
+        for filename, x, y, width, height, flip_h, flip_v, flip_d, hit_box_algorithm in self.textures:
+            files.append(filename)
+            numbers.append((x, y, width, height))
+            flips.append((flip_h, flip_v, flip_d))
+            hit_box_algorithms.append(hit_box_algorithm)
+        arrays = {
+            "layer_names": np.array([name for name, positions, ids in self.layers], dtype=str),
+            "texture_files": np.array(files, dtype=str),
+            "texture_rectangles": np.array(numbers, dtype=np.int64).reshape(-1, 4),
+            "texture_flips": np.array(flips, dtype=bool).reshape(-1, 3),
+            "texture_hit_boxes": np.array(hit_box_algorithms, dtype=str),
+        }
+        for i, (name, positions, ids) in enumerate(self.layers):
+            arrays["positions_{}".format(i)] = positions
+            arrays["texture_ids_{}".format(i)] = ids
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp.npz")
+        np.savez(temp_path, **arrays)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a compiled map saved with :py:meth:`save`.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            textures = []
+            for filename, (x, y, width, height), (flip_h, flip_v, flip_d), hit_box_algorithm in zip(
+                    data["texture_files"], data["texture_rectangles"], data["texture_flips"],
+                    data["texture_hit_boxes"]):
+                textures.append((str(filename), int(x), int(y), int(width), int(height),
+                        bool(flip_h), bool(flip_v), bool(flip_d), str(hit_box_algorithm)))
+            layers = []
+            for i, name in enumerate(data["layer_names"]):
+                layers.append((str(name), data["positions_{}".format(i)], data["texture_ids_{}".format(i)]))
+        return cls(layers, textures)
+
+def describe_texture(name, map_directory):
+    """Works out the arguments used to load a texture from the texture's name.
+
+    Arcade names the textures it loads from tilesets like
+    "path/to/image.png-x-y-width-height-flip_h-flip_v-flip_d-hit_box_algorithm".
+    Returns None if the name doesn't look like this.
+    """
+    parts = name.rsplit("-", 8)
+    if len(parts) != 9:
+        return None
+    filename, x, y, width, height, flip_h, flip_v, flip_d, hit_box_algorithm = parts
+    hit_box_algorithm = hit_box_algorithm.strip()
+    flags = {"True": True, "False": False}
+    if not (x.isdigit() and y.isdigit() and width.isdigit() and height.isdigit()):
+        return None
+    if flip_h not in flags or flip_v not in flags or flip_d not in flags:
+        return None
+    if hit_box_algorithm not in ("Simple", "Detailed", "None"):
+        return None
+    try:
+        filename = str(Path(filename).relative_to(map_directory))
+    except ValueError:
+        filename = str(Path(filename))
+    return (filename, int(x), int(y), int(width), int(height),
+            flags[flip_h], flags[flip_v], flags[flip_d], hit_box_algorithm)
+
+def map_cache_key(filepath, sprite_classes):
+    """Returns a hash of everything a compiled map depends on.
+
+    This includes the contents of the map file (and any tileset files it uses), the
+    `sprite_classes` mapping, and the versions of the cache format and of Arcade.
+    """
+    filepath = Path(filepath)
+    content = filepath.read_bytes()
+    digest = sha256(content)
+    for tileset in json.loads(content).get("tilesets", []):
+        if "source" in tileset:
+            tileset_path = filepath.parent / tileset["source"]
+            if tileset_path.exists():
+                digest.update(tileset_path.read_bytes())
+    classes = sorted(
+        (layer_name, sprite_class.__module__ + "." + sprite_class.__qualname__)
+        for layer_name, sprite_class in sprite_classes.items()
+    )
+    digest.update(repr((CACHE_VERSION, arcade.__version__, classes)).encode())
+    return digest.hexdigest()
+
+def user_cache_dir():
+    """Returns the directory where Quest caches compiled maps for the current user.
+
+    This is `quest` inside the usual place for caches on each operating system: the
+    `XDG_CACHE_HOME` directory (usually `~/.cache`) on Linux, `~/Library/Caches` on macOS,
+    and the `LOCALAPPDATA` directory on Windows. Maps are never cached next to the map
+    file, because that might be inside an installed package.
+    """
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"])
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "quest"
+
+def map_cache_path(filepath, sprite_classes, cache_dir=None):
+    """Returns where the compiled version of a map is cached.
+
+    Arguments:
+        filepath: Path to the map file.
+        sprite_classes: The `sprite_classes` the map is loaded with.
+        cache_dir: The directory to cache the map in. Defaults to :py:func:`user_cache_dir`.
+    """
+    filepath = Path(filepath)
+    key = map_cache_key(filepath, sprite_classes)
+    cache_dir = Path(cache_dir) if cache_dir else user_cache_dir()
+    return cache_dir / "{}.{}.npz".format(filepath.stem, key[:16])
@@ -1,4 +1,5 @@
-from collections import defaultdict
+from collections.abc import Mapping
+import numpy as np
 import random
 
 def is_even(x):
@@ -38,10 +39,19 @@ class Maze:
         ╚═╩═══════════╩═══╩═════════╩═════════════════╩═══════╝
 
     There are many different algorithms for generating mazes, and they tend to 
-    produce mazes with different characteristics. This class implements a 
+    produce mazes with different characteristics. By default, this class uses a 
     `depth-first search <http://algostructure.com/specials/maze.php>`_ maze 
     generation algorithm, which tends to produce long corridors without much
-    branching. See :py:meth:`generate` for a description of how this works.
+    branching. See :py:func:`generate_depth_first` for a description of how this
+    works, and `MAZE_GENERATORS` for the other algorithms.
+
+    The maze is stored in a NumPy array of booleans called `passages`, with one
+    entry for each (x, y) point in the maze. When two nodes (see :py:meth:`neighbors`)
+    are connected, the point between them is set to True. This takes one byte per
+    point, so even a 1001x1001 maze only needs about one megabyte, and it means
+    :py:meth:`get_walls` can find all the walls at once instead of checking each point.
+    `links` still works like a dict of the points each node is connected to (see
+    :py:class:`MazeLinks`).
 
     Args:
         columns: the number of columns in the maze (including edge walls).
@@ -50,40 +60,34 @@ class Maze:
     .. _depth-first search: http://algostructure.com/specials/maze.php
     """
 
+    algorithm = "depth_first"
+
     def __init__(self, columns, rows):
         self.columns = columns
         self.rows = rows
+        self.clear()
+
+    def clear(self):
+        """Removes all the connections between nodes, so that every point except the
+        nodes is a wall.
+        """
+        self.passages = np.zeros((self.columns, self.rows), dtype=bool)
 
-    def generate(self, seed=None):
+    @property
+    def links(self):
+        """A :py:class:`MazeLinks` view of the maze, mapping each node to the set of
+        nodes it is connected to.
+        """
+        return MazeLinks(self)
+
+    def generate(self, seed=None, algorithm=None):
         """Generates (or re-generates) a random maze.
 
-        We are always going to keep track of a current point and we're going
-        to keep a list of points that have been visited. Every time a point 
-        becomes the current point, we will add it to `visited`. Also, every
-        time we move to a new current point, we add the old current point to a 
-        stack. This becomes a history of where we have been. 
-
-        Now we see if the current point has any neighbors that have not yet been 
-        visited. If so, choose one randomly, make it the current point, and 
-        repeat. Now the maze is growing like a worm, one point at a time. At 
-        some point, though, the growing worm will get stuck in a dead end, where
-        the current point has no unvisited neighbors. It can't grow anymore.
-
-        This is where the history stack comes in. Since the maze can't grow from
-        the current point, let's pop the most recent point off the history stack
-        and make that the current point instead. If that point has unvisited
-        neighbors, great: we can continue. Otherwise, keep popping points off
-        the history stack until we find one that has unvisited neighbors. 
-
-        When does this end? Once the history stack is empty. That means we have
-        worked our way all the way back to the starting point, and no points 
-        have any unvisited neighbors remaining. This means the maze has filled
-        up its whole world so it's finished!
-
-        If you want to see this in action, 
-        `here <http://algostructure.com/specials/maze.php>`_ is a website with 
-        several different maze-generation algorithms. Choose 
-        "Flood fill/Depth-first."
+        There are several algorithms to choose from (see `MAZE_GENERATORS`). Each one
+        gets its own :py:class:`random.Random` object, so generating one maze doesn't
+        change the random numbers used anywhere else (for example, when several
+        mazes are being generated at the same time). The default algorithm is
+        depth-first search (see :py:func:`generate_depth_first`).
 
         Args:
             seed: If provided, sets the random seed. (Random numbers on 
@@ -91,46 +95,38 @@ class Maze:
                 you set the random seed to the same value, you'll get the same set
                 of random numbers every time. This is helpful when you want to get
                 the same random maze.)
+            algorithm: The name of the algorithm to use. Defaults to `self.algorithm`.
         """
-        if seed:
-            random.seed(seed)
-        self.links = defaultdict(set)
-        visited = set()
-        stack = [(1, 1)]
-        current_point = (1, 1)
-        while len(stack) > 0:
-            visited.add(current_point)
-            unvisited_neighbors = [n for n in self.neighbors(current_point) if n not in visited]
-            if len(unvisited_neighbors) > 0:
-                next_point = random.choice(unvisited_neighbors)
-                self.connect(current_point, next_point)
-                stack.append(current_point)
-                current_point = next_point
-            else:
-                current_point = stack.pop()
+        algorithm = algorithm or self.algorithm
+        if algorithm not in MAZE_GENERATORS:
+            raise ValueError("Unknown maze algorithm {} (algorithms are: {})".format(
+                    algorithm, ", ".join(MAZE_GENERATORS)))
+        self.clear()
+        MAZE_GENERATORS[algorithm](self, random.Random(seed))
 
     def generate_fully_connected_maze(self):
         """Generates a maze where every node is connected to all its neighbors.
         """
-        self.links = defaultdict(set)
+        self.clear()
         x = 1
         while x < self.columns:
             y = 1
             while y < self.rows:
                 for n in self.neighbors((x, y)):
-                    self.links[(x, y)].add(n)
+                    self.connect((x, y), n)
                 y += 2
             x += 2
 
     def connect(self, p0, p1):
-        """Connects two points by storing each in the other's list of links.
+        """Connects two neighboring nodes, by opening up the point between them.
 
         Args:
             p0: A point, which is represented as a tuple of (x, y) coordinates.
             p1: Another point, also a tuple.
         """
-        self.links[p0].add(p1)
-        self.links[p1].add(p0)
+        if not self.are_neighbors(p0, p1):
+            raise ValueError("Only neighboring nodes can be connected, not {} and {}".format(p0, p1))
+        self.passages[self.between(p0, p1)] = True
                 
     def connected(self, p0, p1):
         """Checks whether two points are connected as neighbors.
@@ -142,7 +138,22 @@ class Maze:
         Returns:
             True if the points are connected, otherwise False.
         """
-        return p1 in self.links[p0]
+        return self.are_neighbors(p0, p1) and bool(self.passages[self.between(p0, p1)])
+
+    def are_neighbors(self, p0, p1):
+        """Checks whether two points are two spaces apart horizontally or vertically,
+        and both in bounds.
+        """
+        (x0, y0), (x1, y1) = p0, p1
+        if not ((x0 == x1 and abs(y0 - y1) == 2) or (y0 == y1 and abs(x0 - x1) == 2)):
+            return False
+        return self.is_in_bounds(p0) and self.is_in_bounds(p1)
+
+    def between(self, p0, p1):
+        """Returns the point halfway between two neighboring points.
+        """
+        (x0, y0), (x1, y1) = p0, p1
+        return (x0 + x1) // 2, (y0 + y1) // 2
 
     def neighbors(self, point):
         """Gets a list of the point's neighbors.
@@ -189,37 +200,38 @@ class Maze:
     def get_walls(self):
         """Returns a list of points containing walls in the current maze.
         
-        To find all the walls, we just loop through every (x, y) point in the 
-        maze and check if it's a wall. First off, all the points around the 
-        edges must be walls. Then, If both a point's x and y coordinates are 
-        odd, the point is definitely not a wall (See :py:meth:`neighbors`).
-        If both a point's coordinates are even, it is definitely a wall.
-        For points with one even and one odd coordinate, we need to check the
-        links to see whether the point has been chosen as a link. Otherwise, 
-        it's a wall.
+        To find all the walls, we check every (x, y) point in the maze. First
+        off, all the points around the edges must be walls. Then, If both a
+        point's x and y coordinates are odd, the point is definitely not a wall
+        (See :py:meth:`neighbors`). Every other point is a wall unless it has been
+        opened up to connect two nodes. :py:meth:`get_wall_grid` does this for all
+        the points at once.
 
         Returns:
             A list of (x, y) tuples for wall spaces in the maze.
         """
-        walls = []
-        for i in range(self.columns):
-            for j in range(self.rows):
-                if i == 0 or i == self.columns - 1 or j == 0 or j == self.rows - 1:
-                    walls.append((i, j))
-                elif is_even(i) and is_even(j):
-                    walls.append((i, j))
-                elif is_even(i) and (i+1, j) not in self.links[(i-1, j)]:
-                    walls.append((i, j))
-                elif is_even(j) and (i, j+1) not in self.links[(i, j-1)]:
-                    walls.append((i, j))
+        xs, ys = np.nonzero(self.get_wall_grid())
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def get_wall_grid(self):
+        """Returns a NumPy array of booleans, with the same shape as `passages`, which
+        is True for every point containing a wall.
+        """
+        x = np.arange(self.columns).reshape(-1, 1)
+        y = np.arange(self.rows).reshape(1, -1)
+        nodes = (x % 2 == 1) & (y % 2 == 1)
+        walls = ~(nodes | self.passages)
+        walls[[0, -1], :] = True
+        walls[:, [0, -1]] = True
         return walls
 
     def __str__(self, nodes=False):
         """Produces a string representation of the maze (example above).
 
-        Since the maze is stored in an array of arrays, we can just turn each 
-        array (row of the maze) into a string and then join the rows together 
-        with newline characters.
+        Each wall is drawn with a character which joins up with the walls
+        next to it (see :py:meth:`str_char`). The characters for all the points
+        are worked out at once using NumPy, and then each row of the maze is
+        joined into a string.
 
         Args:
             nodes: If True, points that are nodes (see :py:meth:`neighbors`)
@@ -228,12 +240,20 @@ class Maze:
         Returns:
             A multiline string representation of the maze.
         """
-        walls = set(self.get_walls())
-        rows = []
-        for j in reversed(range(self.rows)):
-            row = [self.str_char((i, j), walls, nodes) for i in range(self.columns)]
-            rows.append(''.join(row))
-        return "\n".join(rows)
+        walls = np.pad(self.get_wall_grid(), 1)
+        inner = walls[1:-1, 1:-1]
+        codes = inner * (
+            walls[2:, 1:-1] * 1 +
+            walls[1:-1, 2:] * 2 +
+            walls[:-2, 1:-1] * 4 +
+            walls[1:-1, :-2] * 8
+        )
+        chars = np.array(list(" ═║╚══╝╩║╔║╠╗╦╣╬"))[codes]
+        if nodes:
+            x = np.arange(self.columns).reshape(-1, 1)
+            y = np.arange(self.rows).reshape(1, -1)
+            chars[(x % 2 == 1) & (y % 2 == 1)] = '*'
+        return "\n".join(''.join(row) for row in chars.T[::-1].tolist())
 
     def str_char(self, point, walls, nodes=False):
         """Determines which character should represent a point in the maze.
@@ -260,6 +280,353 @@ class Maze:
                 code += 8
         return symbols[code]
 
+class StreamingMaze:
+    """A maze which is a fixed number of columns wide, and goes on forever upward.
+
+    A :py:class:`Maze` has to generate all of its rows before any of them can be used,
+    so it can't be endless. StreamingMaze uses Eller's algorithm (see :py:func:`eller_rows`),
+    which only needs to remember one row of nodes to generate the next one. Rows are
+    generated when they are first needed, and rows which are no longer needed can be
+    dropped with :py:meth:`drop_rows`, so the memory used stays the same however far up
+    the maze goes. Dropped rows are gone for good; see :py:meth:`drop_rows` for how the
+    rows above them stay connected.
+
+    Points use the same (x, y) coordinates as :py:class:`Maze`. Row 0 is a solid wall,
+    and the nodes are on odd rows.
+
+    Args:
+        columns: the number of columns in the maze (including edge walls).
+        seed: If provided, sets the random seed (see :py:meth:`Maze.generate`).
+    """
+    def __init__(self, columns, seed=None):
+        self.columns = columns
+        self.width = max((columns - 1) // 2, 0)
+        self.node_rows = eller_rows(self.width, random.Random(seed))
+        self.wall_rows = {}
+        self.first_row = 0
+        self.next_row = 0
+
+    def generate_rows(self, top):
+        """Generates rows until row `top` has been generated.
+        """
+        while self.next_row <= top:
+            if self.next_row == 0:
+                self.wall_rows[0] = np.ones(self.columns, dtype=bool)
+                self.next_row = 1
+                continue
+            east, north = next(self.node_rows)
+            node_row = np.ones(self.columns, dtype=bool)
+            node_row[1:2 * self.width:2] = False
+            node_row[2:2 * self.width:2] = np.logical_not(east)
+            between_row = np.ones(self.columns, dtype=bool)
+            between_row[1:2 * self.width:2] = np.logical_not(north)
+            self.wall_rows[self.next_row] = node_row
+            self.wall_rows[self.next_row + 1] = between_row
+            self.next_row += 2
+
+    def get_wall_row(self, y):
+        """Returns a NumPy array of booleans which is True for each point in row `y`
+        containing a wall, generating rows if needed.
+        """
+        if y < self.first_row:
+            raise ValueError("Row {} has been dropped (the first row is {})".format(y, self.first_row))
+        self.generate_rows(y)
+        return self.wall_rows[y]
+
+    def get_walls(self, bottom, top):
+        """Returns a list of (x, y) tuples for wall spaces in rows `bottom` to `top`
+        (including `top`).
+        """
+        walls = []
+        for y in range(bottom, top + 1):
+            walls += [(x, y) for x in np.flatnonzero(self.get_wall_row(y)).tolist()]
+        return walls
+
+    def drop_rows(self, bottom):
+        """Forgets all the rows below row `bottom`.
+
+        The maze has exactly one path between any two nodes, so some nodes above `bottom`
+        may only have been connected to each other through the dropped rows. To keep them
+        from being cut off, the walls between nodes in the lowest row of nodes above
+        `bottom` are removed, making it one long passage. Returns the y of that row, so
+        that its walls can be updated.
+        """
+        for y in range(self.first_row, min(bottom, self.next_row)):
+            del self.wall_rows[y]
+        self.first_row = max(self.first_row, bottom)
+        y = bottom + 1 if is_even(bottom) else bottom + 2
+        self.get_wall_row(y)[2:2 * self.width:2] = False
+        return y
+
+class MazeLinks(Mapping):
+    """A read-only view of a :py:class:`Maze`'s connections, which works like a dict
+    mapping each node to the set of nodes it is connected to.
+
+    Mazes used to store their connections this way, so `maze.links[(1, 1)]` still
+    returns the set of nodes connected to (1, 1) (or an empty set). Only nodes with
+    at least one connection are included when iterating. To change the maze, use
+    :py:meth:`Maze.connect`.
+
+    Args:
+        maze: The Maze to look at.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __getitem__(self, point):
+        return set(n for n in self.maze.neighbors(point) if self.maze.connected(point, n))
+
+    def __iter__(self):
+        x = 1
+        while x < self.maze.columns:
+            y = 1
+            while y < self.maze.rows:
+                if self[(x, y)]:
+                    yield (x, y)
+                y += 2
+            x += 2
+
+    def __len__(self):
+        return sum(1 for node in self)
+
+MAZE_GENERATORS = {}
+
+def maze_generator(name):
+    """A decorator which adds a maze generation function to `MAZE_GENERATORS`, so that
+    it can be used by :py:meth:`Maze.generate`.
+
+    A maze generation function takes a cleared :py:class:`Maze` and a
+    :py:class:`random.Random`, and connects the maze's nodes. It should only use the
+    random numbers it is given.
+    """
+    def register(generator):
+        MAZE_GENERATORS[name] = generator
+        return generator
+    return register
+
+def node_grid_size(maze):
+    """Returns the number of (columns, rows) of nodes in a maze (see :py:meth:`Maze.neighbors`).
+
+    Maze generation functions number nodes from (0, 0), and node (i, j) is the point
+    (2i + 1, 2j + 1). The point between nodes (i0, j0) and (i1, j1) is
+    (i0 + i1 + 1, j0 + j1 + 1).
+    """
+    return max((maze.columns - 1) // 2, 0), max((maze.rows - 1) // 2, 0)
+
+@maze_generator("depth_first")
+def generate_depth_first(maze, rng):
+    """Generates a maze using depth-first search.
+
+    We are always going to keep track of a current point and we're going
+    to keep a list of points that have been visited. Every time a point 
+    becomes the current point, we will add it to `visited`. Also, every
+    time we move to a new current point, we add the old current point to a 
+    stack. This becomes a history of where we have been. 
+
+    Now we see if the current point has any neighbors that have not yet been 
+    visited. If so, choose one randomly, make it the current point, and 
+    repeat. Now the maze is growing like a worm, one point at a time. At 
+    some point, though, the growing worm will get stuck in a dead end, where
+    the current point has no unvisited neighbors. It can't grow anymore.
+
+    This is where the history stack comes in. Since the maze can't grow from
+    the current point, let's pop the most recent point off the history stack
+    and make that the current point instead. If that point has unvisited
+    neighbors, great: we can continue. Otherwise, keep popping points off
+    the history stack until we find one that has unvisited neighbors. 
+
+    When does this end? Once the history stack is empty. That means we have
+    worked our way all the way back to the starting point, and no points 
+    have any unvisited neighbors remaining. This means the maze has filled
+    up its whole world so it's finished!
+
+    If you want to see this in action, 
+    `here <http://algostructure.com/specials/maze.php>`_ is a website with 
+    several different maze-generation algorithms. Choose 
+    "Flood fill/Depth-first."
+    """
+    visited = set()
+    stack = [(1, 1)]
+    current_point = (1, 1)
+    while len(stack) > 0:
+        visited.add(current_point)
+        unvisited_neighbors = [n for n in maze.neighbors(current_point) if n not in visited]
+        if len(unvisited_neighbors) > 0:
+            next_point = rng.choice(unvisited_neighbors)
+            maze.connect(current_point, next_point)
+            stack.append(current_point)
+            current_point = next_point
+        else:
+            current_point = stack.pop()
+
+@maze_generator("kruskal")
+def generate_kruskal(maze, rng):
+    """Generates a maze using Kruskal's algorithm.
+
+    Start with every node in a group of its own. Then go through every pair of
+    neighboring nodes in a random order. If the two nodes are in different groups,
+    connect them and merge their groups. If they're already in the same group, there's
+    already a path between them, so connecting them would make a loop. At the end,
+    everything is in one group. The groups are kept track of with a "union-find" data
+    structure: each node points to a parent node in its group, and following the
+    parents leads to the group's root. Kruskal's algorithm makes mazes with lots of
+    short dead ends.
+    """
+    width, height = node_grid_size(maze)
+    parent = list(range(width * height))
+    group_size = [1] * (width * height)
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    edges = [(i, j, i + 1, j) for i in range(width - 1) for j in range(height)]
+    edges += [(i, j, i, j + 1) for i in range(width) for j in range(height - 1)]
+    rng.shuffle(edges)
+    for i0, j0, i1, j1 in edges:
+        root0 = find(i0 * height + j0)
+        root1 = find(i1 * height + j1)
+        if root0 != root1:
+            if group_size[root0] < group_size[root1]:
+                root0, root1 = root1, root0
+            parent[root1] = root0
+            group_size[root0] += group_size[root1]
+            maze.passages[i0 + i1 + 1, j0 + j1 + 1] = True
+
+@maze_generator("wilson")
+def generate_wilson(maze, rng):
+    """Generates a maze using Wilson's algorithm.
+
+    Start with one random node in the maze. Then, from each node not yet in the maze,
+    take a random walk until reaching the maze, remembering which way the walk left
+    each node. (If the walk crosses itself, the later direction replaces the earlier
+    one, which erases the loop.) Then follow the remembered directions from the start
+    of the walk, adding each node to the maze. Every possible maze is equally likely
+    with Wilson's algorithm, but the first few walks can take a long time on big grids.
+    """
+    width, height = node_grid_size(maze)
+    node_count = width * height
+    if node_count == 0:
+        return
+    in_maze = bytearray(node_count)
+    in_maze[rng.randrange(node_count)] = 1
+    exits = [0] * node_count
+    steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    for start in range(node_count):
+        node = start
+        while not in_maze[node]:
+            i, j = divmod(node, height)
+            while True:
+                di, dj = steps[int(rng.random() * 4)]
+                if 0 <= i + di < width and 0 <= j + dj < height:
+                    break
+            exits[node] = (i + di) * height + j + dj
+            node = exits[node]
+        node = start
+        while not in_maze[node]:
+            in_maze[node] = 1
+            i0, j0 = divmod(node, height)
+            i1, j1 = divmod(exits[node], height)
+            maze.passages[i0 + i1 + 1, j0 + j1 + 1] = True
+            node = exits[node]
+
+def eller_rows(width, rng, height=None):
+    """Generates a maze one row of nodes at a time, using Eller's algorithm, and yields
+    (east, north) for each row: `east[i]` says whether node i is connected to node i + 1,
+    and `north[i]` says whether node i is connected to node i in the next row.
+
+    Each node in the current row belongs to a group of nodes which are already connected
+    (maybe through earlier rows). Neighbors in different groups are randomly connected,
+    merging their groups. Then each group gets at least one random connection to the
+    next row, so no group is cut off. Nodes in the next row which weren't connected to
+    start out in groups of their own. On the last row, all the remaining groups are
+    connected. Only one row is kept in memory, so if `height` is None, this goes on
+    forever.
+    """
+    groups = list(range(width))
+    next_group = width
+    j = 0
+    while height is None or j < height:
+        last_row = height is not None and j == height - 1
+        members = {}
+        for i, group in enumerate(groups):
+            members.setdefault(group, []).append(i)
+        east = [False] * max(width - 1, 0)
+        for i in range(width - 1):
+            group0, group1 = groups[i], groups[i + 1]
+            if group0 != group1 and (last_row or rng.random() < 0.5):
+                east[i] = True
+                if len(members[group0]) < len(members[group1]):
+                    group0, group1 = group1, group0
+                for node in members[group1]:
+                    groups[node] = group0
+                members[group0] += members.pop(group1)
+        north = [False] * width
+        if not last_row:
+            for group_members in members.values():
+                chosen = [node for node in group_members if rng.random() < 0.5]
+                for node in chosen or [rng.choice(group_members)]:
+                    north[node] = True
+            for i in range(width):
+                if not north[i]:
+                    groups[i] = next_group
+                    next_group += 1
+        yield east, north
+        j += 1
+
+@maze_generator("eller")
+def generate_eller(maze, rng):
+    """Generates a maze using Eller's algorithm (see :py:func:`eller_rows`), which only needs
+    to remember one row at a time.
+    """
+    width, height = node_grid_size(maze)
+    if width == 0:
+        return
+    for j, (east, north) in enumerate(eller_rows(width, rng, height)):
+        maze.passages[2:2 * width:2, 2 * j + 1] = east
+        maze.passages[1:2 * width:2, 2 * j + 2] = north
+
+@maze_generator("recursive_division")
+def generate_recursive_division(maze, rng):
+    """Generates a maze using recursive division.
+
+    This algorithm works the other way around from the others: it starts with every node
+    connected to its neighbors, and adds walls. It splits the maze into two parts with a
+    wall, leaving one random gap, and then does the same to each part, until the parts
+    are only one node wide. Recursive division makes mazes with long straight walls,
+    and since each wall is added all at once, it is very fast.
+    """
+    width, height = node_grid_size(maze)
+    if width == 0 or height == 0:
+        return
+    maze.passages[2:2 * width:2, 1:2 * height:2] = True
+    maze.passages[1:2 * width:2, 2:2 * height:2] = True
+    chambers = [(0, 0, width, height)]
+    while chambers:
+        i, j, chamber_width, chamber_height = chambers.pop()
+        if chamber_width < 2 and chamber_height < 2:
+            continue
+        if chamber_width == chamber_height:
+            horizontal = rng.random() < 0.5
+        else:
+            horizontal = chamber_height > chamber_width
+        if horizontal:
+            wall = j + rng.randrange(chamber_height - 1)
+            gap = i + rng.randrange(chamber_width)
+            maze.passages[2 * i + 1:2 * (i + chamber_width):2, 2 * wall + 2] = False
+            maze.passages[2 * gap + 1, 2 * wall + 2] = True
+            chambers.append((i, j, chamber_width, wall - j + 1))
+            chambers.append((i, wall + 1, chamber_width, j + chamber_height - wall - 1))
+        else:
+            wall = i + rng.randrange(chamber_width - 1)
+            gap = j + rng.randrange(chamber_height)
+            maze.passages[2 * wall + 2, 2 * j + 1:2 * (j + chamber_height):2] = False
+            maze.passages[2 * wall + 2, 2 * gap + 1] = True
+            chambers.append((i, j, wall - i + 1, chamber_height))
+            chambers.append((wall + 1, j, i + chamber_width - wall - 1, chamber_height))
+
 if __name__ == '__main__':
     m = Maze(99, 99)
     m.generate()
@@ -0,0 +1,229 @@
+import arcade
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+import json
+import numpy as np
+
+class TickProfiler:
+    """Records how long each phase of a tick takes.
+
+    A tick is made of several phases: updating the player, updating each NPC, moving
+    sprites, scrolling the viewport, and so on. When a game stutters, the first question
+    is which phase is slow. TickProfiler keeps a record for each tick (and each frame
+    drawn), mapping each phase name to the number of seconds spent in it. Only the most
+    recent `size` records are kept (this is called a ring buffer), so a profiler can run
+    for as long as the game does without using more and more memory.
+
+    Use it like this::
+
+        profiler.start_record()
+        with profiler.phase("player"):
+            game.player.on_update(game)
+        profiler.end_record()
+
+    Arguments:
+        size (int): The number of records to keep.
+    """
+    def __init__(self, size=600):
+        self.records = deque(maxlen=size)
+        self.current_record = None
+
+    def start_record(self):
+        """Starts a new record. Phases timed until :py:meth:`end_record` are added to it.
+        """
+        self.current_record = {}
+
+    def end_record(self):
+        """Adds the current record to the buffer.
+        """
+        if self.current_record is not None:
+            self.records.append(self.current_record)
+            self.current_record = None
+
+    @contextmanager
+    def phase(self, name):
+        """Times the code inside a `with` block as part of the phase called `name`.
+
+        If the same phase is timed more than once in a record (for example, once for each
+        NPC of the same class), the times are added together. Phases timed when no record
+        has been started are ignored.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            record = self.current_record
+            if record is not None:
+                record[name] = record.get(name, 0) + perf_counter() - start
+
+    def wrap(self, obj, method_name, phase):
+        """Replaces a method on an object with a version which is timed as `phase`.
+        """
+        method = getattr(obj, method_name)
+        def timed_method(*args, **kwargs):
+            with self.phase(phase):
+                return method(*args, **kwargs)
+        setattr(obj, method_name, timed_method)
+
+    def phases(self):
+        """Returns the names of all the phases in the buffer, in the order they were first seen.
+        """
+        names = {}
+        for record in self.records:
+            names.update(dict.fromkeys(record))
+        return list(names)
+
+    def percentiles(self, phase, percents=(50, 95, 99)):
+        """Returns the given percentiles of a phase's duration (in seconds), over the
+        records which include that phase. Returns None if no record includes it.
+        """
+        durations = [record[phase] for record in self.records if phase in record]
+        if not durations:
+            return None
+        return list(np.percentile(durations, percents))
+
+    def summary(self, percents=(50, 95, 99)):
+        """Returns a dict mapping each phase name to its percentiles, in milliseconds.
+        """
+        return {
+            phase: [duration * 1000 for duration in self.percentiles(phase, percents)]
+            for phase in self.phases()
+        }
+
+    def dump(self, filename=None):
+        """Returns a copy of the records in the buffer, oldest first.
+
+        Arguments:
+            filename: If given, the records are also saved to this file as JSON.
+        """
+        records = [dict(record) for record in self.records]
+        if filename:
+            with open(filename, "w") as outfile:
+                json.dump(records, outfile, indent=2)
+        return records
+
+    def clear(self):
+        """Removes all the records from the buffer.
+        """
+        self.records.clear()
+
+class ProfilerMixin:
+    """A mixin for QuestGame which profiles every tick and every frame.
+
+    The game gets a :py:class:`TickProfiler` called `profiler`. Each tick is timed as
+    the phase "tick", made up of these phases:
+
+    - "player": the player's `on_update`.
+    - "npc.<class name>": `on_update` for all the NPCs of each class (this is where
+      strategies run).
+    - "physics": the physics engine's update. For a
+      :py:class:`ContinuousPhysicsEngine <quest.engines.ContinuousPhysicsEngine>`, this
+      is split into "physics.integration", "physics.walls", and "physics.pairs".
+    - "scroll": scrolling the viewport.
+
+    Each frame is a separate record, timed as the phase "draw", which includes
+    "draw.<layer name>" for each map layer.
+
+    Press F3 to show or hide an overlay with the 50th, 95th and 99th percentile time of
+    each phase in milliseconds. Working out the percentiles and laying out the text take
+    time too, and the overlay shouldn't slow down the game it is measuring, so the
+    overlay is only updated every `profiler_refresh` frames. To look at the numbers
+    yourself, call
+    `game.profiler.dump()` (or `game.profiler.dump("profile.json")`)::
+
+        class ProfiledMazeGame(ProfilerMixin, MazeGame):
+            show_profiler = True
+
+    Attributes:
+        profiler_size: The number of records the profiler keeps.
+        show_profiler: Whether the overlay is shown.
+        profiler_key: The key which shows and hides the overlay.
+        profiler_refresh: How many frames to wait between updates of the overlay.
+    """
+    profiler_size = 600
+    show_profiler = False
+    profiler_key = arcade.key.F3
+    profiler_refresh = 30
+
+    def setup_physics_engine(self):
+        """Sets up the physics engine as usual, and then times its phases.
+        """
+        super().setup_physics_engine()
+        self.profiler = TickProfiler(self.profiler_size)
+        self.profiler_overlay = None
+        self.profiler_frames = 0
+        engine_phases = [
+            ("update", "physics"),
+            ("update_sprite_positions", "physics.integration"),
+            ("resolve_collisions_with_walls", "physics.walls"),
+            ("resolve_collisions_between_nonwalls", "physics.pairs"),
+        ]
+        for method_name, phase in engine_phases:
+            if hasattr(self.physics_engine, method_name):
+                self.profiler.wrap(self.physics_engine, method_name, phase)
+
+    def tick(self):
+        self.profiler.start_record()
+        with self.profiler.phase("tick"):
+            super().tick()
+        self.profiler.end_record()
+
+    def update_player(self):
+        with self.profiler.phase("player"):
+            super().update_player()
+
+    def update_npc(self, npc):
+        with self.profiler.phase("npc." + type(npc).__name__):
+            super().update_npc(npc)
+
+    def scroll_viewport(self):
+        with self.profiler.phase("scroll"):
+            super().scroll_viewport()
+
+    def on_draw(self):
+        self.profiler.start_record()
+        with self.profiler.phase("draw"):
+            super().on_draw()
+        self.profiler.end_record()
+        if self.show_profiler:
+            self.draw_profiler()
+
+    def draw_layer(self, layer):
+        with self.profiler.phase("draw." + layer.name):
+            super().draw_layer(layer)
+
+    def draw_profiler(self):
+        """Draws the profiler overlay in the top left corner of the screen.
+
+        The overlay is a single :py:class:`arcade.Text`, whose text is replaced with
+        :py:meth:`profiler_overlay_text` every `profiler_refresh` frames.
+        """
+        x = self.view_left + 10
+        y = self.view_bottom + self.screen_height - 10
+        if self.profiler_overlay is None:
+            self.profiler_overlay = arcade.Text(self.profiler_overlay_text(), x, y,
+                    arcade.csscolor.WHITE, 10, width=self.screen_width, font_name="Courier New",
+                    anchor_y="top", multiline=True)
+        elif self.profiler_frames % self.profiler_refresh == 0:
+            self.profiler_overlay.text = self.profiler_overlay_text()
+        self.profiler_frames += 1
+        if self.profiler_overlay.position != (x, y):
+            self.profiler_overlay.position = (x, y)
+        self.profiler_overlay.draw()
+
+    def profiler_overlay_text(self):
+        """Returns the text of the profiler overlay: one line for each phase.
+        """
+        lines = ["{:<22} {:>6} {:>6} {:>6}".format("phase (ms)", "p50", "p95", "p99")]
+        for phase, (p50, p95, p99) in self.profiler.summary().items():
+            lines.append("{:<22} {:>6.2f} {:>6.2f} {:>6.2f}".format(phase[:22], p50, p95, p99))
+        return "\n".join(lines)
+
+    def on_key_press(self, key, modifiers):
+        """Shows or hides the profiler overlay when `profiler_key` is pressed.
+        """
+        if key == self.profiler_key:
+            self.show_profiler = not self.show_profiler
+        else:
+            super().on_key_press(key, modifiers)
@@ -0,0 +1,104 @@
+import arcade
+from arcade.gl.geometry import screen_rectangle
+from pyglet import gl
+from math import floor, ceil
+
+BAKED_VERTEX_SHADER = """
+#version 330
+
+uniform Projection {
+    uniform mat4 matrix;
+} proj;
+
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 v_uv;
+
+void main() {
+    gl_Position = proj.matrix * vec4(in_vert, 0.0, 1.0);
+    v_uv = in_uv;
+}
+"""
+
+BAKED_FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D texture0;
+
+in vec2 v_uv;
+out vec4 f_color;
+
+void main() {
+    f_color = texture(texture0, v_uv);
+}
+"""
+
+_programs = {}
+
+def get_baked_program(ctx):
+    """Returns the shader program used to draw baked textures, creating it if needed.
+    """
+    if ctx not in _programs:
+        _programs[ctx] = ctx.program(
+            vertex_shader=BAKED_VERTEX_SHADER,
+            fragment_shader=BAKED_FRAGMENT_SHADER,
+        )
+    return _programs[ctx]
+
+class BakedSpriteList:
+    """A picture of a sprite list, drawn once into a texture and then drawn as a single rectangle.
+
+    Drawing a sprite list means drawing every sprite in it, every frame. When the sprites
+    never change, this is wasted work. Instead, the sprites can be drawn once into an
+    offscreen texture (using a framebuffer), and the texture can then be drawn each
+    frame as one rectangle, however many sprites there were. This is called "baking."
+
+    The texture has one texel per pixel of the area given by `bounds`, so the baked picture
+    looks the same as the sprites as long as the game isn't zoomed.
+
+    Arguments:
+        sprite_list: The sprites to bake.
+        bounds: The (left, bottom, right, top) area of the map to bake, in pixels.
+    """
+    def __init__(self, sprite_list, bounds):
+        left, bottom, right, top = bounds
+        self.left = floor(left)
+        self.bottom = floor(bottom)
+        self.width = max(ceil(right) - self.left, 1)
+        self.height = max(ceil(top) - self.bottom, 1)
+        self.ctx = arcade.get_window().ctx
+        self.texture = self.ctx.texture((self.width, self.height), components=4)
+        self.texture.filter = self.ctx.NEAREST, self.ctx.NEAREST
+        self.geometry = screen_rectangle(self.left, self.bottom, self.width, self.height)
+        self.render(sprite_list)
+
+    def render(self, sprite_list):
+        """Draws the sprites into the texture.
+
+        The texture starts out transparent. Its alpha channel is blended separately, so
+        that the texture ends up holding premultiplied colors, which :py:meth:`draw` blends
+        onto the screen.
+        """
+        ctx = self.ctx
+        framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        projection = ctx.projection_2d
+        blend_func = ctx.blend_func
+        with framebuffer.activate():
+            framebuffer.clear()
+            ctx.projection_2d = (self.left, self.left + self.width, self.bottom, self.bottom + self.height)
+            gl.glBlendFuncSeparate(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA, gl.GL_ONE, gl.GL_ONE_MINUS_SRC_ALPHA)
+            try:
+                sprite_list.draw()
+            finally:
+                ctx.blend_func = blend_func
+                ctx.projection_2d = projection
+
+    def draw(self):
+        """Draws the baked texture.
+        """
+        ctx = self.ctx
+        blend_func = ctx.blend_func
+        ctx.blend_func = ctx.ONE, ctx.ONE_MINUS_SRC_ALPHA
+        self.texture.use(0)
+        self.geometry.render(get_baked_program(ctx))
+        ctx.blend_func = blend_func
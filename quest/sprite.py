@@ -1,8 +1,27 @@
 from arcade.sprite import Sprite
 from quest.helpers import scale
+from enum import Flag, auto
+from functools import lru_cache
 import arcade
 import os
 
+class CollisionCategory(Flag):
+    """CollisionCategory describes what kind of thing a sprite is, for deciding which
+    sprites can collide with each other.
+
+    Every :py:class:`QuestSprite` has a `collision_category` (what it is) and a
+    `collision_mask` (which categories it collides with). Categories can be combined
+    using `|`, so a sprite which collides with players and NPCs could have
+    `collision_mask = CollisionCategory.PLAYER | CollisionCategory.NPC`.
+    """
+
+    NONE = 0
+    PLAYER = auto()
+    NPC = auto()
+    ITEM = auto()
+    ALL = PLAYER | NPC | ITEM
+
+
 class QuestSprite(Sprite):
     """
     The base class for sprites in Quest.
@@ -15,6 +34,11 @@ class QuestSprite(Sprite):
         strategy: If set, should be a :py:class:`quest.strategy.Strategy`, or another class
             instance with a :py:meth:`choose_course` method.
         speed: The sprite's speed.
+        collision_category: A :py:class:`CollisionCategory` saying what kind of sprite this is.
+        collision_mask: A :py:class:`CollisionCategory` with all the kinds of sprites this sprite
+            collides with. Two sprites only collide when each one's category is in the other's
+            mask, so physics engines can skip checking pairs of sprites which don't care about
+            each other. (This doesn't affect walls, which collide with every sprite.)
 
     Arguments:
         filename: The only required argument is the name of the sprite's image file.
@@ -23,6 +47,8 @@ class QuestSprite(Sprite):
     description = "quest sprite"
     strategy = None
     speed = 1
+    collision_category = CollisionCategory.NPC
+    collision_mask = CollisionCategory.ALL
 
     def set_course(self, vector):
         """Update the `change_x` and `change_y` properties using a vector.
@@ -80,6 +106,7 @@ class Player(QuestSprite):
     """Player
     """
     description = "player"
+    collision_category = CollisionCategory.PLAYER
 
 class NPC(QuestSprite):
     """Non-playable character
@@ -91,6 +118,32 @@ class Background(QuestSprite):
     """
     description = "background"
 
+def get_collision_filter(sprite):
+    """Returns a sprite's (collision_category, collision_mask).
+
+    Sprites which are not :py:class:`QuestSprite` instances collide with everything.
+    """
+    return (
+        getattr(sprite, "collision_category", CollisionCategory.ALL),
+        getattr(sprite, "collision_mask", CollisionCategory.ALL),
+    )
+
+@lru_cache(maxsize=None)
+def filters_collide(filter0, filter1):
+    """Returns whether sprites with these (collision_category, collision_mask) filters
+    can collide: each sprite's category must be in the other sprite's mask.
+
+    There are only a few different filters in a game, so answers are remembered.
+    """
+    category0, mask0 = filter0
+    category1, mask1 = filter1
+    return bool(category0 & mask1) and bool(category1 & mask0)
+
+def can_collide(sprite0, sprite1):
+    """Returns whether two sprites' collision categories and masks let them collide.
+    """
+    return filters_collide(get_collision_filter(sprite0), get_collision_filter(sprite1))
+
 
 
 class EndMixIn:
@@ -1,9 +1,77 @@
 import arcade
 from quest.helpers import tint, shade
+from collections import OrderedDict
 from textwrap import wrap
 
+DEFAULT_FONT = ("calibri", "arial")
+
+class TextCache:
+    """Keeps recently-drawn text ready to draw again.
+
+    Before text can be drawn, each character has to be looked up in the font and laid
+    out, which is slow. :py:func:`arcade.draw_text` does this work again whenever the
+    text changes, so drawing several different strings every frame (like the lines of a
+    modal) means laying out every string every frame. Instead, TextCache keeps an
+    :py:class:`arcade.Text` object for each (text, font, size, color) it has drawn
+    recently. When the cache is full, the text which was drawn least recently is
+    thrown away (this is called "least recently used," or LRU).
+
+    Arguments:
+        max_size (int): The most text objects to keep.
+
+    Attributes:
+        hits: The number of times text was found in the cache.
+        misses: The number of times text had to be laid out.
+    """
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.texts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, x, y, color, font_size, font_name=DEFAULT_FONT):
+        """Returns an :py:class:`arcade.Text` for the text, positioned at (x, y).
+        """
+        key = (text, font_name, font_size, tuple(color))
+        text_object = self.texts.get(key)
+        if text_object is None:
+            self.misses += 1
+            text_object = arcade.Text(text, x, y, color, font_size, font_name=font_name)
+            self.texts[key] = text_object
+            if len(self.texts) > self.max_size:
+                self.texts.popitem(last=False)
+        else:
+            self.hits += 1
+            self.texts.move_to_end(key)
+            if text_object.position != (x, y):
+                text_object.position = (x, y)
+        return text_object
+
+    def draw(self, text, x, y, color, font_size, font_name=DEFAULT_FONT):
+        """Draws text, like :py:func:`arcade.draw_text`, reusing a cached text object if possible.
+        """
+        self.get(text, x, y, color, font_size, font_name).draw()
+
+    def hit_rate(self):
+        """Returns the fraction of lookups which were found in the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def clear(self):
+        """Empties the cache and resets the counters.
+        """
+        self.texts.clear()
+        self.hits = 0
+        self.misses = 0
+
+text_cache = TextCache()
+
 class TextLabel:
     """Draws text onto a specific part of the screen. 
+
+    Text is drawn using the shared :py:data:`text_cache`, so labels which don't change
+    are only laid out once.
     """
     width = 400
     font_size = 16
@@ -22,6 +90,9 @@ class TextLabel:
             self.text_lines = wrap(text, self.wrap_at)
         else:
             self.text_lines = [text]
+        self.highlight_font_color = tint(self.font_color)
+        if self.background_color:
+            self.highlight_background_color = tint(self.background_color)
 
     def draw(self):
         if self.background_color:
@@ -30,14 +101,14 @@ class TextLabel:
                 self.y_center, 
                 self.width,
                 self.height(),
-                tint(self.background_color) if self.highlight else self.background_color 
+                self.highlight_background_color if self.highlight else self.background_color 
             )
         for i, line in enumerate(self.text_lines):
-            arcade.draw_text(
+            text_cache.draw(
                 line, 
                 self.text_x(),
                 self.text_y(i),
-                tint(self.font_color) if self.highlight else self.font_color,
+                self.highlight_font_color if self.highlight else self.font_color,
                 self.font_size
             )
 
@@ -0,0 +1,15 @@
+from quest.clock import Clock, WallClock, TickClock
+from time import time
+
+def test_clock_tells_real_time_by_default():
+    for clock in [Clock(), WallClock()]:
+        before = time()
+        now = clock.time()
+        assert before <= now <= time()
+
+def test_tick_clock_counts_ticks():
+    clock = TickClock(tick_duration=0.5, start_time=10)
+    assert clock.time() == 10
+    for tick in range(3):
+        clock.tick()
+    assert clock.time() == 11.5
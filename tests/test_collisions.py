@@ -0,0 +1,33 @@
+from quest.collisions import StaticSpatialHash, sweep_and_prune
+from itertools import combinations
+import arcade
+import random
+
+def make_sprite(rng, max_size=40):
+    sprite = arcade.SpriteSolidColor(rng.randint(2, max_size), rng.randint(2, max_size), arcade.color.WHITE)
+    sprite.position = rng.uniform(0, 500), rng.uniform(0, 500)
+    return sprite
+
+def test_spatial_hash_finds_the_same_sprites_as_checking_every_sprite():
+    rng = random.Random(0)
+    walls = arcade.SpriteList()
+    for i in range(200):
+        walls.append(make_sprite(rng))
+    for cell_size in (None, 7, 100):
+        index = StaticSpatialHash(walls, cell_size)
+        for i in range(200):
+            sprite = make_sprite(rng, 80)
+            assert index.query_sprite(sprite) == arcade.check_for_collision_with_list(sprite, walls)
+
+def test_sweep_and_prune_finds_the_same_pairs_as_checking_every_pair():
+    rng = random.Random(1)
+    sprites = [make_sprite(rng) for i in range(150)]
+    for sprite in sprites:
+        sprite.group = rng.choice("abc")
+    all_pairs = [(sprite0, sprite1) for sprite0, sprite1 in combinations(sprites, 2)
+                 if arcade.check_for_collision(sprite0, sprite1)]
+    assert all_pairs
+    assert sweep_and_prune(sprites) == all_pairs
+    can_pair = lambda group0, group1: group0 == "a" or group1 == "a"
+    grouped = sweep_and_prune(sprites, lambda sprite: sprite.group, can_pair)
+    assert grouped == [pair for pair in all_pairs if can_pair(pair[0].group, pair[1].group)]
@@ -0,0 +1,268 @@
+from quest.headless import headless
+from quest.examples.maze import MazeGame
+from quest.examples.endless_maze import EndlessMazeGame
+from quest.examples.island_discrete import IslandAdventureDiscrete
+from quest.collisions import get_bounds, bounds_overlap
+from quest.sprite import CollisionCategory, NPC
+from quest.helpers import QuestSpriteList, resolve_resource_path
+from collections import deque
+import arcade
+import random
+import pytest
+
+# A sprite should never move far enough in one update to cross a one-tile wall.
+MAX_STEP = MazeGame.tile_size / 2
+
+def make_maze_game(seed=0):
+    game = headless(MazeGame)()
+    game.get_current_map().generate_maze(seed)
+    return game
+
+def get_tile(game, sprite):
+    # Like the walls, tiles are offset by half a tile (see inside_maze).
+    return (int((sprite.center_x - game.tile_size / 2) // game.tile_size),
+            int((sprite.center_y - game.tile_size / 2) // game.tile_size))
+
+def overlapping_walls(game, sprite):
+    bounds = get_bounds(sprite)
+    return [wall for wall in game.wall_list if bounds_overlap(bounds, get_bounds(wall))]
+
+def inside_maze(game, sprite):
+    # Wall tiles are placed with their lower left corners at grid cell centers, so the
+    # maze's outer walls span from half a tile to one and a half tiles past its edges.
+    low = game.tile_size / 2
+    high_x = (game.grid_columns + 0.5) * game.tile_size
+    high_y = (game.grid_rows + 0.5) * game.tile_size
+    return low < sprite.center_x < high_x and low < sprite.center_y < high_y
+
+@pytest.mark.parametrize("seed", range(5))
+def test_player_leaves_start_tile(seed):
+    # The player starts in the corner of the first cell, overlapping the walls around it.
+    # The first cell always has a passage up or to the right.
+    distances = []
+    for change in [(5, 0), (0, 5)]:
+        game = make_maze_game(seed)
+        player = game.player
+        start_tile = get_tile(game, player)
+        for tick in range(40):
+            player.change_x, player.change_y = change
+            game.physics_engine.update()
+        assert inside_maze(game, player)
+        assert not overlapping_walls(game, player)
+        distances.append(abs(player.center_x - 48) + abs(player.center_y - 48))
+        if get_tile(game, player) != start_tile:
+            break
+    assert get_tile(game, player) != start_tile
+    assert max(distances) > game.tile_size
+
+@pytest.mark.parametrize("change", [(-5, -5), (-5, 0), (0, -5), (-5, 5), (5, -5)])
+def test_sprite_wedged_in_corner_is_not_pushed_through_walls(change):
+    game = make_maze_game()
+    player = game.player
+    for tick in range(30):
+        x, y = player.position
+        player.change_x, player.change_y = change
+        game.physics_engine.update()
+        assert abs(player.center_x - x) < MAX_STEP and abs(player.center_y - y) < MAX_STEP
+        assert inside_maze(game, player)
+
+def test_sprite_overlapping_several_walls_is_not_teleported():
+    game = make_maze_game()
+    player = game.player
+    player.center_x, player.center_y = 48.5, 205.5
+    player.change_x, player.change_y = -5, 5
+    game.physics_engine.update()
+    assert abs(player.center_x - 48.5) < MAX_STEP and abs(player.center_y - 205.5) < MAX_STEP
+    assert inside_maze(game, player)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_walk_stays_in_maze(seed):
+    rng = random.Random(seed)
+    game = make_maze_game(seed)
+    game.running = True
+    player = game.player
+    visited = set()
+    for tick in range(600):
+        if tick % 10 == 0:
+            velocity = rng.choice([-5, 0, 5]), rng.choice([-5, 0, 5])
+        player.change_x, player.change_y = velocity
+        game.tick()
+        assert inside_maze(game, player)
+        visited.add(get_tile(game, player))
+    assert len(visited) >= 4
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_walk_stays_in_endless_maze(seed):
+    rng = random.Random(seed)
+    game = headless(EndlessMazeGame)()
+    game.running = True
+    player = game.player
+    low = game.tile_size / 2
+    high_x = (game.grid_columns + 0.5) * game.tile_size
+    visited = set()
+    for tick in range(600):
+        if tick % 10 == 0:
+            velocity = rng.choice([-5, 0, 5]), rng.choice([-5, 0, 5])
+        player.change_x, player.change_y = velocity
+        game.tick()
+        assert low < player.center_x < high_x and low < player.center_y
+        visited.add(get_tile(game, player))
+    assert len(visited) >= 4
+
+def plan_climb(game):
+    """Finds a path through the maze's free tiles to the highest tile the player can reach."""
+    maze_map = game.get_current_map()
+    start = (round(game.player.center_x / game.tile_size) - 1, round(game.player.center_y / game.tile_size) - 1)
+    came_from = {start: None}
+    queue = deque([start])
+    best = start
+    while queue:
+        x, y = queue.popleft()
+        if y > best[1]:
+            best = (x, y)
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) in came_from or not maze_map.bottom_row < ny <= maze_map.top_row:
+                continue
+            if not maze_map.maze.get_wall_row(ny)[nx]:
+                came_from[(nx, ny)] = (x, y)
+                queue.append((nx, ny))
+    path = []
+    while best != start:
+        path.append(best)
+        best = came_from[best]
+    return path[::-1]
+
+# Seed 29 used to trap the player around row 78, when dropped rows cut it off.
+@pytest.mark.parametrize("seed", [0, 29])
+def test_player_climbs_endless_maze(seed):
+    game = headless(type("SeededEndlessMazeGame", (EndlessMazeGame,), {"maze_seed": seed}))()
+    game.running = True
+    player = game.player
+    maze_map = game.get_current_map()
+    start_y = player.center_y
+    path = []
+    for tick in range(2000):
+        if game.best_row >= 90:
+            break
+        path = path or plan_climb(game)
+        assert path, "the player is trapped"
+        target_x, target_y = [(i + 1) * game.tile_size for i in path[0]]
+        player.change_x = max(-5, min(5, target_x - player.center_x))
+        player.change_y = max(-5, min(5, target_y - player.center_y))
+        game.tick()
+        if abs(player.center_x - target_x) < 1 and abs(player.center_y - target_y) < 1:
+            path.pop(0)
+    assert game.best_row >= 90
+    assert player.center_y > start_y + 80 * game.tile_size
+    assert maze_map.bottom_row > 0
+    assert maze_map.maze.first_row == maze_map.bottom_row
+    assert maze_map.maze.next_row > 90
+
+class CollisionCounter(NPC):
+    collisions = 0
+
+    def on_collision(self, sprite, game):
+        self.collisions += 1
+
+def add_counter(game, x, y):
+    counter = CollisionCounter(resolve_resource_path("images/items/coin.png"), 0.5)
+    counter.position = x, y
+    game.npc_list.append(counter)
+    return counter
+
+@pytest.mark.parametrize("sleep_after", [0, 1, 60])
+def test_sprites_in_contact_keep_colliding_instead_of_sleeping(sleep_after):
+    game = make_maze_game()
+    game.physics_engine.sleep_after = sleep_after
+    sprite0 = add_counter(game, 160, 160)
+    sprite1 = add_counter(game, 160, 160)
+    loner = add_counter(game, 300, 300)
+    for tick in range(100):
+        game.physics_engine.update()
+    assert sprite0.collisions == sprite1.collisions == 100
+    assert not sprite0.asleep and not sprite1.asleep
+    assert loner.asleep
+
+@pytest.mark.parametrize("seed", range(3))
+def test_discrete_engine_keeps_occupancy_grid_up_to_date(seed):
+    rng = random.Random(seed)
+    game = headless(IslandAdventureDiscrete)()
+    game.running = True
+    player = game.player
+    occupancy = game.physics_engine.occupancy
+    for tick in range(300):
+        if tick % 15 == 0:
+            velocity = rng.choice([-5, 0, 5]), rng.choice([-5, 0, 5])
+        player.change_x, player.change_y = velocity
+        game.tick()
+        tiles = [cell for cell in occupancy.cells + list(occupancy.outside.values()) if player in cell]
+        assert tiles == [occupancy.occupants(player.current_tile)]
+        assert tiles[0].count(player) == 1
+
+def test_sprites_do_not_sleep_by_default():
+    game = make_maze_game()
+    loner = add_counter(game, 300, 300)
+    for tick in range(100):
+        game.physics_engine.update()
+    assert not getattr(loner, "asleep", False)
+
+def test_sprites_moved_without_velocity_stay_awake():
+    game = make_maze_game()
+    game.physics_engine.sleep_after = 5
+    pushed = add_counter(game, 300, 300)
+    still = add_counter(game, 500, 500)
+    for tick in range(30):
+        pushed.center_x += 1
+        game.physics_engine.update()
+    assert not pushed.asleep
+    assert still.asleep
+
+class ThinWall(arcade.SpriteSolidColor):
+    collisions = 0
+
+    def on_collision(self, sprite, game):
+        self.collisions += 1
+
+@pytest.mark.parametrize("swept_collisions", [False, True])
+def test_swept_collisions_stop_fast_sprites_at_thin_walls(swept_collisions):
+    game = make_maze_game()
+    game.physics_engine.swept_collisions = swept_collisions
+    wall = ThinWall(4, 200, arcade.color.WHITE)
+    wall.position = 300, 300
+    game.wall_list = QuestSpriteList()
+    game.wall_list.append(wall)
+    player = game.player
+    player.position = 250, 300
+    player.change_x, player.change_y = 80, 0
+    game.physics_engine.update()
+    if swept_collisions:
+        assert player.right <= wall.left
+        assert wall.collisions == 1
+    else:
+        assert player.left > wall.right
+        assert wall.collisions == 0
+
+@pytest.mark.parametrize("merge_walls", [False, True])
+def test_wall_collisions_match_checking_every_wall(merge_walls):
+    rng = random.Random(3)
+    game = make_maze_game(3)
+    engine = game.physics_engine
+    engine.merge_walls = merge_walls
+    engine.build_wall_index()
+    if merge_walls:
+        assert len(engine.wall_geometry) < len(game.wall_list)
+    player = game.player
+    for i in range(500):
+        player.position = rng.uniform(0, 1100), rng.uniform(0, 1100)
+        assert engine.get_wall_collisions(player) == arcade.check_for_collision_with_list(player, game.wall_list)
+
+@pytest.mark.parametrize("pair_broadphase", ["sweep", "exhaustive"])
+def test_only_sprites_with_matching_filters_collide(pair_broadphase):
+    game = make_maze_game()
+    game.physics_engine.pair_broadphase = pair_broadphase
+    items = [add_counter(game, 160, 160) for i in range(2)]
+    for item in items:
+        item.collision_category, item.collision_mask = CollisionCategory.ITEM, CollisionCategory.PLAYER
+    npcs = [add_counter(game, 300, 300) for i in range(2)]
+    game.physics_engine.update()
+    assert [sprite.collisions for sprite in items + npcs] == [0, 0, 1, 1]
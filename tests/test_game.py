@@ -0,0 +1,25 @@
+from quest.headless import headless
+from quest.examples.maze import MazeGame
+
+class FixedTimestepMazeGame(MazeGame):
+    fixed_timestep = True
+    tick_rate = 4
+    max_ticks_per_update = 5
+
+def test_fixed_timestep_runs_one_tick_per_tick_duration():
+    game = headless(FixedTimestepMazeGame)()
+    game.running = True
+    for delta_time, ticks in [(0.25, 1), (0.125, 1), (0.125, 2), (0.75, 5), (0.5, 7)]:
+        game.on_update(delta_time)
+        assert game.clock.ticks == ticks
+
+def test_fixed_timestep_drops_time_beyond_max_ticks_per_update():
+    game = headless(FixedTimestepMazeGame)()
+    game.running = True
+    game.on_update(10.125)
+    assert game.clock.ticks == 5
+    assert game.tick_accumulator == 0.125
+    game.on_update(0.125)
+    assert game.clock.ticks == 6
+    game.on_update(0.125)
+    assert game.clock.ticks == 6
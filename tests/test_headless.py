@@ -0,0 +1,35 @@
+from quest.headless import headless
+from quest.examples.maze import MazeGame
+import arcade
+import os
+import pytest
+import subprocess
+import sys
+
+def test_headless_game_runs_without_a_display():
+    env = {name: value for name, value in os.environ.items() if name not in ("DISPLAY", "WAYLAND_DISPLAY")}
+    script = (
+        "from quest.headless import headless\n"
+        "from quest.examples.maze import MazeGame\n"
+        "game = headless(MazeGame)()\n"
+        "print(game.run(120), game.clock.time())\n"
+    )
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=repo, env=env, capture_output=True, text=True,
+            timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1].split() == ["120", "2.0"]
+
+def test_headless_game_does_not_open_a_window():
+    game = headless(MazeGame)()
+    assert game.run(60) == 60
+    assert game.tick_count == 60
+    with pytest.raises(RuntimeError):
+        arcade.get_window()
+
+def test_headless_game_stops_when_it_quits():
+    game = headless(MazeGame)()
+    game.run(10)
+    game.quit()
+    assert game.step(10) == 0
+    assert game.tick_count == 10
@@ -0,0 +1,92 @@
+from quest.helpers import QuestSpriteList, SpriteListList, pack_atlas, resolve_resource_path
+from quest.map import TiledMap
+from quest.sprite import Wall, Background
+from pathlib import Path
+import arcade
+import shutil
+
+ISLAND = Path(resolve_resource_path("images/island/island.json"))
+SPRITE_CLASSES = {"Obstacles": Wall, "Background": Background}
+
+def make_sprite():
+    return arcade.SpriteSolidColor(10, 10, arcade.color.WHITE)
+
+def test_removed_sprites_are_forgotten_without_a_window():
+    sprite_list = QuestSpriteList()
+    for i in range(10):
+        sprite = make_sprite()
+        sprite_list.append(sprite)
+        sprite.remove_from_sprite_lists()
+    assert len(sprite_list) == 0
+    assert not sprite_list._deferred_sprites
+
+def get_pixels(tiled_map):
+    return [
+        (layer.name, sorted((sprite.position, sprite.texture.image.convert("RGBA").tobytes())
+                for sprite in layer.sprite_list))
+        for layer in tiled_map.layers
+    ]
+
+def test_atlas_textures_match_separate_images(tmp_path):
+    map_dir = tmp_path / "island"
+    shutil.copytree(ISLAND.parent, map_dir, ignore=shutil.ignore_patterns("__*"))
+    atlas = pack_atlas(sorted(map_dir.glob("img_*.png")), map_dir / "atlas.png")
+    assert len(atlas.regions) > 100
+    loaded = get_pixels(TiledMap(map_dir / ISLAND.name, SPRITE_CLASSES))
+    from_atlas = TiledMap(map_dir / ISLAND.name, SPRITE_CLASSES, atlas=map_dir / "atlas.json")
+    assert get_pixels(from_atlas) == loaded
+    assert all(sprite.texture.name.startswith(str(map_dir / "atlas.png"))
+               for layer in from_atlas.layers for sprite in layer.sprite_list)
+
+def test_quest_sprite_list_version_counts_changes_to_the_list():
+    sprite_list = QuestSpriteList()
+    sprites = [make_sprite() for i in range(4)]
+    changes = [
+        lambda: sprite_list.append(sprites[0]),
+        lambda: sprite_list.insert(0, sprites[1]),
+        lambda: sprite_list.extend(sprites[2:]),
+        lambda: sprite_list.swap(0, 1),
+        lambda: sprite_list.reverse(),
+        lambda: sprite_list.sort(key=lambda sprite: sprite.center_x),
+        lambda: sprite_list.__setitem__(0, make_sprite()),
+        lambda: sprite_list.remove(sprites[2]),
+        lambda: sprite_list.pop(),
+        lambda: sprite_list.clear(),
+    ]
+    for change in changes:
+        version = sprite_list.version
+        change()
+        assert sprite_list.version > version
+    assert sprite_list.sprite_version == 0
+
+def test_quest_sprite_list_sprite_version_counts_changes_to_sprites():
+    sprite = make_sprite()
+    sprite_list = QuestSpriteList()
+    sprite_list.append(sprite)
+    version = sprite_list.version
+    for change in ("center_x", "position", "width", "angle", "color"):
+        sprite_version = sprite_list.sprite_version
+        setattr(sprite, change, {"position": (5, 5), "color": arcade.color.RED}.get(change, 20))
+        assert sprite_list.sprite_version > sprite_version
+    assert sprite_list.version == version
+
+def test_sprite_list_list_reuses_sprites_until_a_list_changes():
+    lists = [QuestSpriteList(), QuestSpriteList()]
+    lists[0].append(make_sprite())
+    sprite_list_list = SpriteListList(lists)
+    sprites = sprite_list_list.sprites()
+    assert sprite_list_list.sprites() is sprites
+    lists[0][0].position = 100, 100
+    assert sprite_list_list.sprites() is sprites
+    lists[1].append(make_sprite())
+    assert sprite_list_list.sprites() is not sprites
+    assert sprite_list_list.sprites() == [lists[0][0], lists[1][0]]
+    lists[0].pop()
+    assert list(sprite_list_list) == [lists[1][0]]
+
+def test_sprite_list_list_rebuilds_sprites_from_plain_sprite_lists():
+    plain = arcade.SpriteList()
+    sprite_list_list = SpriteListList([QuestSpriteList(), plain])
+    assert sprite_list_list.sprites() == []
+    plain.append(make_sprite())
+    assert sprite_list_list.sprites() == [plain[0]]
@@ -0,0 +1,43 @@
+from quest.lod import SimulationLOD
+from types import SimpleNamespace
+import arcade
+
+def make_game(*positions):
+    game = SimpleNamespace(view_left=0, view_bottom=0, screen_width=100, screen_height=100, updates=[])
+    game.npc_list = []
+    for x, y in positions:
+        npc = arcade.SpriteSolidColor(10, 10, arcade.color.WHITE)
+        npc.position = x, y
+        npc.change_x, npc.change_y = 2, -1
+        game.npc_list.append(npc)
+    game.update_npc = game.updates.append
+    return game
+
+def run(lod, game, ticks):
+    """Runs `ticks` ticks, returning each NPC's total movement and number of updates."""
+    moves = [[0, 0] for npc in game.npc_list]
+    game.updates.clear()
+    for tick in range(ticks):
+        lod.update_npcs(game)
+        for move, npc in zip(moves, game.npc_list):
+            move[0] += npc.change_x
+            move[1] += npc.change_y
+    return moves, [sum(update is npc for update in game.updates) for npc in game.npc_list]
+
+def test_far_npcs_update_less_often_at_the_same_speed():
+    lod = SimulationLOD([(200, 1), (1000, 4)])
+    game = make_game((50, 50), (600, 50), (2000, 50))
+    moves, updates = run(lod, game, 8)
+    assert updates == [8, 2, 0]
+    assert moves == [[16, -8], [16, -8], [0, 0]]
+
+def test_npcs_get_their_velocity_back_when_they_come_closer():
+    lod = SimulationLOD([(200, 1), (1000, 4)])
+    game = make_game((600, 50), (2000, 50))
+    run(lod, game, 3)
+    for npc in game.npc_list:
+        npc.position = 50, 50
+    moves, updates = run(lod, game, 4)
+    assert updates == [4, 4]
+    assert moves == [[8, -4], [8, -4]]
+    assert all((npc.change_x, npc.change_y) == (2, -1) for npc in game.npc_list)
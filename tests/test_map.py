@@ -0,0 +1,74 @@
+from quest.map import MapLayer, GridMapLayer
+from quest.sprite import Wall
+from quest.helpers import resolve_resource_path
+import arcade
+
+VIEWPORT = (0, 100, 0, 100)
+
+def make_layer(*positions):
+    layer = MapLayer("test", chunk_size=100)
+    for x, y in positions:
+        sprite = arcade.SpriteSolidColor(10, 10, arcade.color.WHITE)
+        sprite.position = x, y
+        layer.sprite_list.append(sprite)
+    return layer
+
+def test_chunks_are_rebuilt_when_a_sprite_moves():
+    layer = make_layer((50, 50))
+    assert layer.get_visible_chunk_keys(VIEWPORT) == [(0, 0)]
+    layer.sprite_list[0].position = 550, 550
+    assert layer.get_visible_chunk_keys(VIEWPORT) == []
+
+def test_chunks_are_rebuilt_when_sprites_are_replaced():
+    layer = make_layer((50, 50))
+    assert layer.get_visible_chunk_keys(VIEWPORT) == [(0, 0)]
+    layer.sprite_list.pop()
+    sprite = arcade.SpriteSolidColor(10, 10, arcade.color.WHITE)
+    sprite.position = 550, 550
+    layer.sprite_list.append(sprite)
+    assert len(layer.sprite_list) == 1
+    assert layer.get_visible_chunk_keys(VIEWPORT) == []
+
+def test_baked_chunks_are_thrown_away_when_a_sprite_changes_color():
+    layer = make_layer((50, 50))
+    layer.static = True
+    assert layer.get_visible_chunk_keys(VIEWPORT) == [(0, 0)]
+    layer.baked_chunks[(0, 0)] = "baked"
+    assert layer.get_visible_chunk_keys(VIEWPORT) == [(0, 0)]
+    assert (0, 0) in layer.baked_chunks
+    layer.sprite_list[0].color = arcade.color.RED
+    assert layer.get_visible_chunk_keys(VIEWPORT) == [(0, 0)]
+    assert (0, 0) not in layer.baked_chunks
+
+def test_rebuilding_chunks_releases_old_chunks():
+    layer = make_layer((50, 50), (250, 50))
+    sprite = layer.sprite_list[0]
+    layer.get_visible_chunk_keys(VIEWPORT)
+    sprite_list_count = len(sprite.sprite_lists)
+    for rebuild in range(10):
+        layer.invalidate_chunks()
+        layer.get_visible_chunk_keys(VIEWPORT)
+        sprite.position = 50 + rebuild, 50
+        layer.get_visible_chunk_keys(VIEWPORT)
+    assert len(sprite.sprite_lists) == sprite_list_count == 2
+
+def make_grid_layer():
+    return GridMapLayer("walls", 10, 8, 320, 192, sprite_filename=resolve_resource_path("images/box.png"),
+            sprite_class=Wall)
+
+def describe_sprites(layer):
+    return [(type(sprite), sprite.position, sprite.left, sprite.bottom, sprite.texture.name,
+            sprite.get_adjusted_hit_box()) for sprite in layer.sprite_list]
+
+def test_add_sprites_places_sprites_like_add_sprite():
+    positions = [(0, 0), (3, 1), (9, 7), (4, 4), (3, 1)]
+    one_at_a_time = make_grid_layer()
+    for x, y in positions:
+        one_at_a_time.add_sprite(x, y)
+    all_at_once = make_grid_layer()
+    sprites = all_at_once.add_sprites(positions)
+    assert list(all_at_once.sprite_list) == sprites
+    assert describe_sprites(all_at_once) == describe_sprites(one_at_a_time)
+    assert all_at_once.add_sprites([]) == []
+    all_at_once.clear()
+    assert len(all_at_once.sprite_list) == 0
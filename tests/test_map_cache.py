@@ -0,0 +1,35 @@
+from quest.map import TiledMap
+from quest.map_cache import map_cache_path
+import sys
+import pytest
+from quest.sprite import Wall, Background
+from quest.helpers import resolve_resource_path
+from pathlib import Path
+
+ISLAND = Path(resolve_resource_path("images/island/island.json"))
+SPRITE_CLASSES = {"Obstacles": Wall, "Background": Background}
+
+def get_tiles(tiled_map):
+    return [
+        (layer.name, sorted((sprite.position, sprite.texture.name) for sprite in layer.sprite_list))
+        for layer in tiled_map.layers
+    ]
+
+def test_maps_are_not_cached_by_default():
+    before = set(ISLAND.parent.iterdir())
+    TiledMap(ISLAND, SPRITE_CLASSES)
+    assert set(ISLAND.parent.iterdir()) == before
+
+def test_cached_map_matches_loaded_map(tmp_path):
+    before = set(ISLAND.parent.iterdir())
+    loaded = get_tiles(TiledMap(ISLAND, SPRITE_CLASSES))
+    assert get_tiles(TiledMap(ISLAND, SPRITE_CLASSES, cache=tmp_path)) == loaded
+    assert len(list(tmp_path.glob("island.*.npz"))) == 1
+    assert get_tiles(TiledMap(ISLAND, SPRITE_CLASSES, cache=tmp_path)) == loaded
+    assert set(ISLAND.parent.iterdir()) == before
+
+@pytest.mark.skipif(sys.platform in ("darwin", "win32"), reason="XDG_CACHE_HOME is only used on Linux")
+def test_cache_goes_in_user_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = map_cache_path(ISLAND, SPRITE_CLASSES)
+    assert path.parent == tmp_path / "quest"
@@ -0,0 +1,80 @@
+from quest.examples.maze import MazeMap
+from quest.maze import Maze, StreamingMaze, MAZE_GENERATORS, node_grid_size
+from collections import deque
+from itertools import product
+import numpy as np
+import pytest
+import random
+
+def get_level(seed):
+    maze_map = MazeMap(33, 33, 32, 25)
+    maze_map.generate_maze(seed)
+    return [
+        sorted(sprite.position for sprite in maze_map.get_layer_by_name(layer_name).sprite_list)
+        for layer_name in ("walls", "loot")
+    ]
+
+def test_maze_map_seed_reproduces_level():
+    level = get_level(12)
+    random.seed(99)
+    assert get_level(12) == level
+    assert get_level(13) != level
+
+SMALL_SIZES = list(product(range(1, 10), repeat=2)) + [(2, 5), (1, 9), (9, 1), (20, 21), (31, 11)]
+
+def assert_perfect(maze):
+    """Checks that every node can reach every other node by exactly one path."""
+    nodes = [(x, y) for x in range(1, maze.columns - 1, 2) for y in range(1, maze.rows - 1, 2)]
+    width, height = node_grid_size(maze)
+    assert len(nodes) == width * height
+    links = maze.links
+    edges = sum(len(links[node]) for node in nodes) // 2
+    assert maze.passages.sum() == edges
+    if not nodes:
+        return
+    assert edges == len(nodes) - 1
+    reached = {nodes[0]}
+    queue = deque([nodes[0]])
+    while queue:
+        for neighbor in links[queue.popleft()]:
+            if neighbor not in reached:
+                reached.add(neighbor)
+                queue.append(neighbor)
+    assert len(reached) == len(nodes)
+
+@pytest.mark.parametrize("algorithm", list(MAZE_GENERATORS))
+def test_generators_make_perfect_mazes(algorithm):
+    for columns, rows in SMALL_SIZES:
+        maze = Maze(columns, rows)
+        maze.generate(seed=1, algorithm=algorithm)
+        assert_perfect(maze)
+
+@pytest.mark.parametrize("algorithm", list(MAZE_GENERATORS))
+def test_generators_are_deterministic_per_seed(algorithm):
+    for columns, rows in SMALL_SIZES:
+        mazes = []
+        for seed in (5, 5, 6):
+            maze = Maze(columns, rows)
+            random.seed(seed + 100)
+            maze.generate(seed=seed, algorithm=algorithm)
+            mazes.append(maze.passages.copy())
+        assert np.array_equal(mazes[0], mazes[1])
+    assert not np.array_equal(mazes[0], mazes[2])
+
+@pytest.mark.parametrize("bottom", [10, 11])
+def test_streaming_maze_top_is_reachable_after_dropping_rows(bottom):
+    for seed in range(10):
+        maze = StreamingMaze(21, seed)
+        maze.generate_rows(60)
+        opened_row = maze.drop_rows(bottom)
+        assert opened_row in (bottom + 1, bottom + 2)
+        free = {(x, y) for y in range(opened_row, 60) for x in np.flatnonzero(~maze.get_wall_row(y)).tolist()}
+        reached = {(x, y) for x, y in free if y == 59}
+        queue = deque(reached)
+        while queue:
+            x, y = queue.popleft()
+            for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbor in free and neighbor not in reached:
+                    reached.add(neighbor)
+                    queue.append(neighbor)
+        assert reached == free
@@ -0,0 +1,29 @@
+from quest.sprite import CollisionCategory, NPC, Player, can_collide, filters_collide
+from quest.helpers import resolve_resource_path
+import arcade
+
+IMAGE = resolve_resource_path("images/items/coin.png")
+
+class Item(NPC):
+    collision_category = CollisionCategory.ITEM
+    collision_mask = CollisionCategory.PLAYER
+
+class Shy(NPC):
+    collision_mask = CollisionCategory.NPC
+
+def test_filters_collide_when_each_category_is_in_the_other_mask():
+    player = (CollisionCategory.PLAYER, CollisionCategory.ALL)
+    item = (CollisionCategory.ITEM, CollisionCategory.PLAYER)
+    ghost = (CollisionCategory.NPC, CollisionCategory.NONE)
+    assert filters_collide(player, item) and filters_collide(item, player)
+    assert not filters_collide(item, item)
+    assert not filters_collide(ghost, player) and not filters_collide(player, ghost)
+    assert not filters_collide(ghost, ghost)
+
+def test_can_collide_uses_sprites_categories_and_masks():
+    player, npc, item, shy = Player(IMAGE), NPC(IMAGE), Item(IMAGE), Shy(IMAGE)
+    plain = arcade.Sprite(IMAGE)
+    assert can_collide(player, npc) and can_collide(player, item) and can_collide(npc, npc)
+    assert not can_collide(item, npc) and not can_collide(item, item)
+    assert can_collide(shy, npc) and not can_collide(shy, player) and not can_collide(player, shy)
+    assert all(can_collide(plain, sprite) for sprite in (player, npc, item, shy, plain))
@@ -0,0 +1,36 @@
+from quest.text_label import TextCache
+import arcade
+import pytest
+
+class FakeText:
+    """Stands in for arcade.Text, which can't lay out text without a window."""
+    def __init__(self, text, x, y, color, font_size, font_name=None):
+        self.text = text
+        self.position = (x, y)
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(arcade, "Text", FakeText)
+    return TextCache(max_size=2)
+
+def test_text_cache_counts_hits_and_misses(cache):
+    first = cache.get("a", 0, 0, arcade.color.WHITE, 12)
+    assert cache.get("a", 10, 20, arcade.color.WHITE, 12) is first
+    assert first.position == (10, 20)
+    assert cache.get("a", 10, 20, arcade.color.RED, 12) is not first
+    assert cache.get("a", 10, 20, arcade.color.WHITE, 14) is not first
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert cache.hit_rate() == 0.25
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache.texts)) == (0, 0, 0)
+
+def test_text_cache_forgets_the_least_recently_used_text(cache):
+    a = cache.get("a", 0, 0, arcade.color.WHITE, 12)
+    b = cache.get("b", 0, 0, arcade.color.WHITE, 12)
+    assert cache.get("a", 0, 0, arcade.color.WHITE, 12) is a
+    cache.get("c", 0, 0, arcade.color.WHITE, 12)
+    assert [key[0] for key in cache.texts] == ["a", "c"]
+    assert cache.get("a", 0, 0, arcade.color.WHITE, 12) is a
+    assert cache.get("b", 0, 0, arcade.color.WHITE, 12) is not b
+    assert [key[0] for key in cache.texts] == ["a", "b"]
+    assert (cache.hits, cache.misses) == (2, 4)